@@ -9,15 +9,14 @@ It contains the following commands:
 import discord
 from discord.ext import commands
 from discord import app_commands
-from helpers.helpers import get_guild_member_check_role, update_json_file
-from typing import Dict, Optional
+from helpers.helpers import get_guild_member_check_role, get_member
+from helpers.contributor_index import ContributorRegistry
 
 
 class ContributorCommandsCog(commands.Cog):
-    def __init__(self, bot, contributors, emoji_dicts):
+    def __init__(self, bot, contributors: ContributorRegistry):
         self.bot = bot
         self.contributors = contributors
-        self.emoji_dicts = emoji_dicts
 
     @app_commands.command(name="contributors")
     async def list_contributors(self, interaction: discord.Interaction):
@@ -30,16 +29,14 @@ class ContributorCommandsCog(commands.Cog):
         # Defer the response
         await interaction.response.defer()
 
-        server_name = interaction.guild.name
-        emoji_dict = self.emoji_dicts.get(server_name)
-        if emoji_dict is None:
+        contributor_index = self.contributors.get(interaction.guild)
+        if not contributor_index.emojis:
             await interaction.followup.send(
-                f"No emoji dictionary found for server: {server_name}"
+                f"No emoji dictionary found for server: {interaction.guild.name}"
             )
             return
 
-        emoji_list = [emoji for emoji in emoji_dict.keys()]
-        emoji_text = "\n".join(emoji_list)
+        emoji_text = "\n".join(contributor_index.emojis)
         message = f" :fire: **List of Contributors** :fire: \n" f"{emoji_text}"
         await interaction.followup.send(message)
 
@@ -61,50 +58,12 @@ class ContributorCommandsCog(commands.Cog):
             return
         if user_mention:
             uid = user_mention.strip("<@!>").split(">")[0]
-            server_contributors = self.contributors.get(interaction.guild.name)
-            if server_contributors is None:
-                await interaction.followup.send(
-                    "No contributors found for server: " + interaction.guild.name
-                )
+            contributor_index = self.contributors.get(interaction.guild)
+            if contributor_index.remove(uid) is None:
+                await interaction.followup.send("Contributor not found.")
                 return
-            for contributor in server_contributors:
-                if contributor["uid"] == uid:
-                    emoji_dict = self.emoji_dicts.get(interaction.guild.name)
-                    if emoji_dict is None:
-                        await interaction.followup.send(
-                            "Emoji dictionary not found for server: "
-                            + interaction.guild.name
-                        )
-                        return
-                    emoji_id_to_remove = next(
-                        (
-                            emoji_id
-                            for emoji_id, c in emoji_dict.items()
-                            if c == contributor["uid"]
-                        ),
-                        None,
-                    )
-                    if emoji_id_to_remove:
-                        del emoji_dict[emoji_id_to_remove]
-                    server_contributors.remove(contributor)
-                    self.contributors[
-                        interaction.guild.name
-                    ] = server_contributors  # Update the contributors with the updated server_contributors
-                    self.emoji_dicts[
-                        interaction.guild.name
-                    ] = emoji_dict  # Update the emoji_dicts with the updated emoji_dict
-                    update_json_file(
-                        interaction.guild.name,
-                        {
-                            "contributors": server_contributors,
-                            "emoji_dictionary": emoji_dict,
-                        },
-                    )
-                    await interaction.followup.send(
-                        f"Contributor removed successfully!"
-                    )
-                    return
-            await interaction.followup.send("Contributor not found.")
+            self.bot.store.remove_contributor(interaction.guild.id, uid)
+            await interaction.followup.send(f"Contributor removed successfully!")
         else:
             await interaction.followup.send(
                 "Please provide the mention of the contributor to remove."
@@ -131,41 +90,19 @@ class ContributorCommandsCog(commands.Cog):
             return
         uid = user_mention.strip("<@!>")
         emoji_id = emoji
-        server_contributors = self.contributors.get(interaction.guild.name)
-        if server_contributors is None:
-            await interaction.followup.send(
-                "No contributors found for server: " + interaction.guild.name
-            )
-            return
-        existing_contributor: Optional[Dict[str, str]] = next(
-            (c for c in server_contributors if c["uid"] == uid), None
-        )
+        contributor_index = self.contributors.get(interaction.guild)
 
+        existing_contributor = contributor_index.get_contributor(uid)
         if existing_contributor:
             await interaction.followup.send(
                 f"Contributor {existing_contributor['uid']} already exists"
             )
         else:
-            emoji_dict = self.emoji_dicts.get(interaction.guild.name)
-            if emoji_dict is None:
-                await interaction.followup.send(
-                    "Emoji dictionary not found for server: " + interaction.guild.name
-                )
-                return
-
             # Get the user's username
-            user = await interaction.guild.fetch_member(int(uid))
+            user = await get_member(interaction.guild, int(uid))
             note = user.name if user else "User not found"
 
-            new_contributor = {"uid": uid, "note": note}
-            server_contributors.append(new_contributor)
-            emoji_dict[
-                emoji_id
-            ] = uid  # Use the UID directly as the value in emoji_id_mapping
-
-            update_json_file(
-                interaction.guild.name,
-                {"contributors": server_contributors, "emoji_dictionary": emoji_dict},
-            )
+            contributor_index.add(uid, note, emoji_id)
+            self.bot.store.add_contributor(interaction.guild.id, uid, note, emoji_id)
 
             await interaction.followup.send(f"Contributor added successfully!")
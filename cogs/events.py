@@ -9,23 +9,33 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from helpers.helpers import get_guild_member_check_role
+from helpers.contributor_index import ContributorRegistry
+from helpers.channel_index import invalidate_channel_index
+from helpers.cache_profile import report_ready
+from events.event_index import (
+    get_event_index,
+    index_event,
+    unindex_event,
+    invalidate_event_index,
+)
+from helpers.permissions import invalidate_guild_roles
 from logger.logger import logger
 from discord import ScheduledEvent
 from events.event_operations import (
-    notify_new_event,
     process_new_member,
     handle_message,
     handle_reaction,
     process_reaction_add,
 )
 from consts.constants import RULES_MESSAGE_ID
+from typing import List
 
 
 class EventsCog(commands.Cog):
-    def __init__(self, bot, contributors, emoji_dicts):
+    def __init__(self, bot, contributors: ContributorRegistry):
         self.bot = bot
         self.contributors = contributors
-        self.emoji_dicts = emoji_dicts
+        self.reported_ready = False
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -34,45 +44,117 @@ class EventsCog(commands.Cog):
         """
         print(f"Logged in as {self.bot.user.name} ({self.bot.user.id})")
 
+        # Every guild is known once the bot is ready, so legacy contributors can be adopted by name. A process that
+        # runs a subset of the shards cannot see the guilds of the others, it relies on [LEGACY_CONTRIBUTORS] instead
+        if self.bot.shard_partition.owns_all:
+            self.contributors.adopt_legacy(self.bot.guilds)
+
+        # Report the startup cost of the cache profile once, on_ready is dispatched again after reconnecting
+        if not self.reported_ready:
+            report_ready(self.bot, self.bot.started_at)
+            self.reported_ready = True
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id: int):
+        """
+        Handles the on_shard_ready event. This event is triggered when a shard of an AutoShardedBot has connected.
+
+        Parameters:
+        shard_id (int): The ID of the shard.
+        """
+        shard = self.bot.get_shard(shard_id)
+        logger.info(
+            f"Shard {shard_id}/{shard.shard_count} is ready with a latency of {shard.latency * 1000:.0f}ms"
+        )
+
     @commands.Cog.listener()
     async def on_scheduled_event_create(self, event: ScheduledEvent):
         """
         Handles the on_scheduled_event_create event. This event is triggered when a new scheduled event is created.
-        notify_new_event is then invoked to notify the guild about the new event after a delay.
+        The announcement of the new event is scheduled with the event announcer, which posts it after a delay.
 
         Parameters:
         event (ScheduledEvent): The event that was created.
         """
         logger.info(f"New scheduled event created: {event.name}")
-        await notify_new_event(self.bot, event, event.guild_id)
+        index_event(event)
+        self.bot.event_announcer.schedule(event)
 
     @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    async def on_scheduled_event_update(
+        self, before: ScheduledEvent, after: ScheduledEvent
+    ):
         """
-        Event triggered when a message is sent in a server the bot is in.
+        Handles the on_scheduled_event_update event. The event is updated in the scheduled event index. An event that
+        was cancelled or has ended is removed from the index and its pending announcement is dropped, other edits are
+        picked up when the event is announced.
 
         Parameters:
-        self (EventCommandsCog): An instance of the EventCommandsCog class.
-        message (Message): The message that was sent.
+        before (ScheduledEvent): The event before the update.
+        after (ScheduledEvent): The event after the update.
+        """
+        if after.status in (
+            discord.EventStatus.canceled,
+            discord.EventStatus.completed,
+        ):
+            unindex_event(after)
+            self.bot.event_announcer.cancel(after.id)
+            self.bot.interest_roster.forget(after.id)
+        else:
+            index_event(after)
 
-        Returns:
-        None
+    @commands.Cog.listener()
+    async def on_scheduled_event_delete(self, event: ScheduledEvent):
         """
-        await handle_message(self.bot, message, self.emoji_dicts)
+        Handles the on_scheduled_event_delete event. The event is removed from the scheduled event index,
+        and its pending announcement, if any, is dropped.
+
+        Parameters:
+        event (ScheduledEvent): The event that was deleted.
+        """
+        unindex_event(event)
+        self.bot.event_announcer.cancel(event.id)
+        self.bot.interest_roster.forget(event.id)
 
     @commands.Cog.listener()
-    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
+    async def on_scheduled_event_user_add(
+        self, event: ScheduledEvent, user: discord.User
+    ):
         """
-        Event triggered when a reaction is added to a message in a sever the bot is in.
+        Handles the on_scheduled_event_user_add event. The user is added to the interest roster of the event.
+
+        Parameters:
+        event (ScheduledEvent): The event the user is interested in.
+        user (User): The user.
+        """
+        self.bot.interest_roster.add(event.id, user.id)
+
+    @commands.Cog.listener()
+    async def on_scheduled_event_user_remove(
+        self, event: ScheduledEvent, user: discord.User
+    ):
+        """
+        Handles the on_scheduled_event_user_remove event. The user is removed from the interest roster of the event.
+
+        Parameters:
+        event (ScheduledEvent): The event the user is no longer interested in.
+        user (User): The user.
+        """
+        self.bot.interest_roster.remove(event.id, user.id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """
+        Event triggered when a message is sent in a server the bot is in.
 
         Parameters:
         self (EventCommandsCog): An instance of the EventCommandsCog class.
-        reaction (Reaction): The reaction that was added.
-        user (User): The user who added the reaction.
+        message (Message): The message that was sent.
 
         Returns:
+        None
         """
-        await handle_reaction(self.bot, reaction, user, self.emoji_dicts)
+        await handle_message(self.bot, message, self.contributors)
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
@@ -85,9 +167,113 @@ class EventsCog(commands.Cog):
         Returns:
         None
         """
+        await handle_reaction(self.bot, payload, self.contributors)
         if payload.message_id == RULES_MESSAGE_ID:
             await process_reaction_add(self.bot, payload)
 
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        """
+        Event triggered when a channel is created in a server the bot is in.
+        The channel index of the server is dropped, so it is rebuilt on the next lookup.
+
+        Parameters:
+        channel (GuildChannel): The channel that was created.
+        """
+        invalidate_channel_index(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        """
+        Event triggered when a channel is updated, for example renamed, in a server the bot is in.
+        The channel index of the server is dropped, so it is rebuilt on the next lookup.
+
+        Parameters:
+        before (GuildChannel): The channel before the update.
+        after (GuildChannel): The channel after the update.
+        """
+        invalidate_channel_index(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """
+        Event triggered when a channel is deleted in a server the bot is in.
+        The channel index of the server is dropped, so it is rebuilt on the next lookup.
+
+        Parameters:
+        channel (GuildChannel): The channel that was deleted.
+        """
+        invalidate_channel_index(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        """
+        Event triggered when the bot leaves a server, its channel, scheduled event and contributor indexes are dropped.
+
+        Parameters:
+        guild (Guild): The guild the bot left.
+        """
+        invalidate_channel_index(guild.id)
+        invalidate_event_index(guild.id)
+        self.contributors.evict(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        """
+        Event triggered when the bot joins a server, its contributors are loaded.
+
+        Parameters:
+        guild (Guild): The guild the bot joined.
+        """
+        self.contributors.load(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        """
+        Event triggered when a server becomes available again, for example after reconnecting.
+        Its scheduled event index is dropped and its interest rosters are seeded again, as events and interest
+        may have changed while it was unavailable, and its contributors are loaded.
+
+        Parameters:
+        guild (Guild): The guild that became available.
+        """
+        invalidate_event_index(guild.id)
+        self.bot.interest_roster.refresh_guild(guild.id)
+        self.contributors.load(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        """
+        Event triggered when a role is created in a server the bot is in, the cached core roles are dropped.
+
+        Parameters:
+        role (Role): The role that was created.
+        """
+        invalidate_guild_roles(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """
+        Event triggered when a role is updated in a server the bot is in, the cached core roles are dropped.
+
+        Parameters:
+        before (Role): The role before the update.
+        after (Role): The role after the update.
+        """
+        invalidate_guild_roles(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """
+        Event triggered when a role is deleted in a server the bot is in, the cached core roles are dropped.
+
+        Parameters:
+        role (Role): The role that was deleted.
+        """
+        invalidate_guild_roles(role.guild.id)
+
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         """
@@ -158,14 +344,10 @@ class EventsCog(commands.Cog):
         permitted = await get_guild_member_check_role(interaction)
 
         if not permitted:
-            await interaction.response.send_message(
-                "You do not have permission to use this command."
-            )
             return
 
-        # Fetch the list of events
-        events = await guild.fetch_scheduled_events()
-        event = next((e for e in events if e.name == event_name), None)
+        # Look the event up in the scheduled event index
+        event = get_event_index(guild).get_by_name(event_name)
 
         if event:
             # Delete the event
@@ -173,3 +355,24 @@ class EventsCog(commands.Cog):
             await interaction.followup.send(f"Event '{event_name}' has been deleted 🗑️")
         else:
             await interaction.followup.send(f"No event found with name '{event_name}'.")
+
+    @delete_event.autocomplete("event_name")
+    async def delete_event_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        """
+        Suggest the events whose name starts with what has been typed so far.
+
+        Parameters:
+        interaction (discord.Interaction): The autocomplete interaction.
+        current (str): The text typed so far.
+
+        Returns:
+        List[app_commands.Choice[str]]: The matching events, with the event name as value.
+        """
+        if interaction.guild is None:
+            return []
+        return [
+            app_commands.Choice(name=event.name[:100], value=event.name)
+            for event in get_event_index(interaction.guild).search_names(current)
+        ]
@@ -3,6 +3,7 @@ The GovCommandsCog class is a cog that contains the commands for the governance
 It contains the following commands:
 - vote_draft: Draft, edit, or delete a vote proposal.
 - publish_draft: Publish an existing draft proposal.
+It also keeps the vote ledger of ongoing proposals up to date from reaction events.
 
 """
 
@@ -10,15 +11,51 @@ It contains the following commands:
 import discord
 from discord.ext import commands
 from discord import app_commands
+from typing import List, Optional
+from proposals.paged_select_view import PagedSelectView
 from proposals.proposal_buttons_view import ProposalButtonsView
 from proposals.proposal_selects import PublishDraftSelect
-from proposals.proposals import proposals
+from proposals.proposals import handle_publishdraft, reconcile_ongoing_votes
 
 
 class GovCommandsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """
+        Handles the on_ready event. The vote ledger is reconciled with the vote messages of the ongoing proposals,
+        so reactions made while the bot was offline are counted.
+        """
+        await reconcile_ongoing_votes(self.bot)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        """
+        Event triggered when a raw reaction is added to a message. Votes on ongoing proposals are recorded in the vote ledger.
+
+        Parameters:
+        payload (RawReactionActionEvent): The payload for the raw reaction add event.
+        """
+        if payload.user_id != self.bot.user.id:
+            self.bot.vote_ledger.add_reaction(
+                payload.message_id, payload.user_id, str(payload.emoji)
+            )
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        """
+        Event triggered when a raw reaction is removed from a message. Votes on ongoing proposals are removed from the vote ledger.
+
+        Parameters:
+        payload (RawReactionActionEvent): The payload for the raw reaction remove event.
+        """
+        if payload.user_id != self.bot.user.id:
+            self.bot.vote_ledger.remove_reaction(
+                payload.message_id, payload.user_id, str(payload.emoji)
+            )
+
     @app_commands.command(name="vote_draft")
     async def vote_draft(self, interaction: discord.Interaction) -> None:
         """
@@ -28,7 +65,7 @@ class GovCommandsCog(commands.Cog):
         interaction (discord.Interaction): The interaction of the command invocation.
         """
         try:
-            view = ProposalButtonsView(proposals)
+            view = ProposalButtonsView(self.bot.drafts, interaction.guild_id)
             await interaction.response.send_message(
                 "Click create to create a new proposal, edit, or delete to modify an existing proposal.",
                 view=view,
@@ -37,16 +74,53 @@ class GovCommandsCog(commands.Cog):
             await interaction.response.send_message("Couldn't access proposal data.")
 
     @app_commands.command(name="publish_draft")
-    async def publish_draft(self, interaction: discord.Interaction) -> None:
+    async def publish_draft(
+        self, interaction: discord.Interaction, draft: Optional[str] = None
+    ) -> None:
         """
-        Publish an existing draft proposal.
+        Publish an existing draft proposal. Without a draft, a select menu of the drafts is shown.
 
         Parameters:
         interaction (discord.Interaction): The interaction of the command invocation.
+        draft (Optional[str]): The draft ID chosen from the autocomplete, or the title of the draft.
         """
+        if draft is not None:
+            # Accept a typed title as well as an autocompleted draft ID
+            selected = self.bot.drafts.get(
+                interaction.guild_id, draft
+            ) or self.bot.drafts.get_by_title(interaction.guild_id, draft)
+            draft_id = selected["draft_id"] if selected else draft
+            await handle_publishdraft(interaction, draft_id, self.bot)
+            return
+
+        if not self.bot.drafts.count(interaction.guild_id):
+            await interaction.response.send_message("No proposals to publish.")
+            return
+
         try:
-            view = discord.ui.View()
-            view.add_item(PublishDraftSelect(proposals, self.bot))
+            view = PagedSelectView(
+                self.bot.drafts.list(interaction.guild_id),
+                lambda drafts: PublishDraftSelect(drafts, self.bot),
+            )
             await interaction.response.send_message("Select a proposal.", view=view)
         except Exception as e:
             await interaction.response.send_message("Couldn't access proposal data.")
+
+    @publish_draft.autocomplete("draft")
+    async def publish_draft_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        """
+        Suggest the drafts whose title starts with what has been typed so far.
+
+        Parameters:
+        interaction (discord.Interaction): The autocomplete interaction.
+        current (str): The text typed so far.
+
+        Returns:
+        List[app_commands.Choice[str]]: The matching drafts, with the draft ID as value.
+        """
+        return [
+            app_commands.Choice(name=draft["title"][:100], value=draft["draft_id"])
+            for draft in self.bot.drafts.search(interaction.guild_id, current)
+        ]
@@ -1,11 +1,12 @@
 import configparser
-from logger.logger import logger
+from typing import Dict, Optional
 
-# Map of proposal types to their respective ID keys in the config file
-CONFIG_ID_MAP: dict[str, str] = {"governance": "governance_id", "budget": "budget_id"}
 CONFIG_ABSOLUTE_PATH = "config/config.ini"
 
-# File paths for JSON files containing information about contributors and posted events IDs
+# File path for the database that holds the bot's state, see storage/storage.py
+DATABASE_FILE_PATH = "./data/bloom.db"
+
+# File paths for the JSON files used by earlier versions, these are migrated into the database at startup
 CONTRIBUTORS_FILE_PATH = "./data/contributors.json"
 POSTED_EVENTS_FILE_PATH = "./data/posted_events.json"
 ONGOING_VOTES_FILE_PATH = "./data/ongoing_votes.json"
@@ -13,58 +14,97 @@ ONGOING_VOTES_FILE_PATH = "./data/ongoing_votes.json"
 
 # Load configuration
 config: configparser.ConfigParser = configparser.ConfigParser()
-config.read("config/config.ini")
+config.read(CONFIG_ABSOLUTE_PATH)
 
+# The last proposal IDs used before the sequences moved to the database, see proposals/id_allocator.py.
+# These only seed the sequences the first time the bot starts, and are never written back.
 current_governance_id: int = config.getint("ID_START_VALUES", "governance_id")
 current_budget_id: int = config.getint("ID_START_VALUES", "budget_id")
 
-
-# Update values when proposals are submitted.
-def update_id_values(id_value: int, id_type: str) -> None:
-    config = configparser.ConfigParser()
-    config.read("config/config.ini")
-
-    if id_type.lower() == "governance":
-        config["ID_START_VALUES"]["governance_id"] = str(id_value)
-    elif id_type.lower() == "budget":
-        config["ID_START_VALUES"]["budget_id"] = str(id_value)
-
-    with open("config/config.ini", "w") as configfile:
-        config.write(configfile)
-
-
-def increment_config_id(
-    id_type: str, increment: int = +1, config: configparser.ConfigParser = config
-) -> None:
-    """
-    Increments the ID value for a given proposal type in the config file.
-
-    Note: Use typed id_types instead of using raw strings these can be imported from consts
-
-    Args:
-      id_type: A string specifying the ID type ('governance' or 'budget')
-      increment: An integer specifying how much to increment the ID by (default 1)
-      config: A ConfigParser instance (default uses config initialized here)
-
-    Returns:
-        None
-    """
-
-    id_type = id_type.lower()
-
-    if id_type not in CONFIG_ID_MAP:
-        err_msg = f"Invalid id_type: {id_type}"
-        logger.error(err_msg)
-        raise ValueError(err_msg)
-
-    key = CONFIG_ID_MAP[id_type]
-    config["ID_START_VALUES"][key] += str(increment)
-
-    try:
-        with open(CONFIG_ABSOLUTE_PATH, "w") as f:
-            config.write(f)
-
-    except IOError as e:
-        err_msg = f"Error writing config file: {e}"
-        logger.error(err_msg)
-        raise Exception(err_msg, e)
+# Settings for the bot's own REST calls, see helpers/http_client.py
+HTTP_TIMEOUT: float = config.getfloat("HTTP", "timeout", fallback=10.0)
+HTTP_CONNECT_TIMEOUT: float = config.getfloat("HTTP", "connect_timeout", fallback=5.0)
+HTTP_POOL_SIZE: int = config.getint("HTTP", "pool_size", fallback=10)
+HTTP_KEEPALIVE_TIMEOUT: float = config.getfloat(
+    "HTTP", "keepalive_timeout", fallback=30.0
+)
+
+# Settings for the cache of users resolved from the API, see helpers/user_resolver.py
+USER_CACHE_SIZE: int = config.getint("USER_CACHE", "size", fallback=1000)
+USER_CACHE_TTL: float = config.getfloat("USER_CACHE", "ttl", fallback=3600.0)
+
+# Settings for the queue that delivers contributor DMs, see helpers/dm_queue.py
+DM_WORKERS: int = config.getint("DM_QUEUE", "workers", fallback=4)
+DM_QUEUE_SIZE: int = config.getint("DM_QUEUE", "max_size", fallback=1000)
+DM_MAX_RETRIES: int = config.getint("DM_QUEUE", "max_retries", fallback=5)
+DM_DEAD_LETTER_FILE_PATH = "./data/dm_dead_letters.log"
+
+# Settings for the Node worker that creates Snapshot proposals, see proposals/snapshot_worker.py
+SNAPSHOT_WORKER_SCRIPT = "./snapshot/worker.js"
+SNAPSHOT_TIMEOUT: float = config.getfloat("SNAPSHOT", "timeout", fallback=120.0)
+SNAPSHOT_CONCURRENCY: int = config.getint("SNAPSHOT", "concurrency", fallback=2)
+SNAPSHOT_RESTART_DELAY: float = config.getfloat(
+    "SNAPSHOT", "restart_delay", fallback=5.0
+)
+
+# Retry settings for the side effects of concluding a proposal, see proposals/conclusion_outbox.py
+OUTBOX_BASE_DELAY: float = config.getfloat("OUTBOX", "base_delay", fallback=30.0)
+OUTBOX_MAX_DELAY: float = config.getfloat("OUTBOX", "max_delay", fallback=3600.0)
+
+# Settings for the hourly sweep for upcoming events, see tasks/tasks.py
+EVENT_CHECK_CONCURRENCY: int = config.getint("EVENT_CHECK", "concurrency", fallback=5)
+EVENT_CHECK_GUILD_TIMEOUT: float = config.getfloat(
+    "EVENT_CHECK", "guild_timeout", fallback=120.0
+)
+
+# How long to wait before announcing a newly created event, see events/announcements.py
+EVENT_ANNOUNCEMENT_DELAY: float = config.getfloat(
+    "EVENT_ANNOUNCEMENT", "delay", fallback=30 * 60.0
+)
+
+# How many proposal IDs to reserve in the database at once, see proposals/id_allocator.py
+PROPOSAL_ID_BLOCK_SIZE: int = config.getint("PROPOSAL_IDS", "block_size", fallback=1)
+
+# Checkpoint settings for the database's write-ahead log, see storage/storage.py
+WAL_AUTOCHECKPOINT: int = config.getint("STORAGE", "wal_autocheckpoint", fallback=10000)
+CHECKPOINT_INTERVAL: float = config.getfloat(
+    "STORAGE", "checkpoint_interval", fallback=300.0
+)
+CHECKPOINT_WAL_SIZE: int = config.getint(
+    "STORAGE", "checkpoint_wal_size", fallback=1024 * 1024
+)
+CHECKPOINT_TRUNCATE_WAL_SIZE: int = config.getint(
+    "STORAGE", "checkpoint_truncate_wal_size", fallback=16 * 1024 * 1024
+)
+
+# Settings for the contributor indexes kept in memory, see helpers/contributor_index.py
+CONTRIBUTOR_CACHE_SIZE: int = config.getint("CONTRIBUTORS", "max_guilds", fallback=100)
+CONTRIBUTOR_CACHE_IDLE_TTL: float = config.getfloat(
+    "CONTRIBUTORS", "idle_ttl", fallback=24 * 3600.0
+)
+
+# guild ID -> the server name earlier versions stored the contributors of the guild under, see helpers/contributor_index.py
+LEGACY_CONTRIBUTOR_GUILDS: Dict[int, str] = (
+    {
+        int(guild_id): server
+        for guild_id, server in config.items("LEGACY_CONTRIBUTORS", raw=True)
+    }
+    if config.has_section("LEGACY_CONTRIBUTORS")
+    else {}
+)
+
+# Settings for running the bot as an AutoShardedBot, see helpers/sharding.py. The --shard-ids and --shard-count
+# command line options of main.py take precedence.
+SHARDED: bool = config.getboolean("SHARDING", "enabled", fallback=False)
+SHARD_COUNT: Optional[int] = config.getint("SHARDING", "shard_count", fallback=None)
+SHARD_IDS: Optional[str] = config.get("SHARDING", "shard_ids", fallback=None)
+
+# Settings for the gateway caches, see helpers/cache_profile.py. Each setting overrides the one of the profile.
+CACHE_PROFILE: str = config.get("CACHE", "profile", fallback="full")
+CACHE_CHUNK_GUILDS_AT_STARTUP: Optional[bool] = config.getboolean(
+    "CACHE", "chunk_guilds_at_startup", fallback=None
+)
+CACHE_MEMBER_CACHE: Optional[str] = config.get("CACHE", "member_cache", fallback=None)
+CACHE_MAX_MESSAGES: Optional[int] = config.getint(
+    "CACHE", "max_messages", fallback=None
+)
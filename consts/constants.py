@@ -1,8 +1,6 @@
 """
 consts/constants.py contains constants used throughout the bot.
 
-CONFIG_ID_MAP: A dictionary containing the valid ids and keys that can be selected to be incremented or in rare cases decremented in the config.ini file.
-
 CONFIG_ABSOLUTE_PATH: The absolute path to the config.ini file.
 
 GENERAL_CHANNEL, GOVERNANCE_CHANNEL, GOVERNANCE_BUDGET_CHANNEL, GOVERNANCE_TALK_CHANNEL
@@ -18,6 +16,8 @@ ABSTAIN_VOTE: The emoji used to abstain from voting on a proposal. Can be replac
 new_proposal_emoji: The emoji used to inform the bot you wish to draft a new governance proposal.
 This is required when !v or !vote_draft command is invoked.
 
+CORE_ROLE_NAME: The name of the role, compared case-insensitively, that is permitted to use privileged commands.
+
 RULES_MESSAGE_ID: The ID of the message that contains the rules/welcome message.
 
 DISCORD_ROLE_TRIGGERS: A list of dictionaries. Each dictionary represents a role that can be assigned to a bloomer.
@@ -58,6 +58,8 @@ CONSTANT_FALLBACK_MAPPING = {
     GOVERNANCE_TALK_CHANNEL: FALLBACK_GOVERNANCE_TALK_CHANNEL,
 }
 
+CORE_ROLE_NAME = "core"
+
 RULES_MESSAGE_ID = 1202059311681904661  # Set to ID of whatever message you want to be used as rules / to welcome a user
 DISCORD_ROLE_TRIGGERS = [
     {"name": "Client", "emoji_id": 1199583728129802322, "role": "Client Pod"},
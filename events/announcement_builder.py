@@ -0,0 +1,79 @@
+"""
+events/announcement_builder.py contains the AnnouncementBuilder, which packs the announcement of several events
+into as few messages as possible without exceeding Discord's message length limit.
+
+Each event is added as a section, a title line followed by a list of mentions. Sections are appended to the
+current message while they fit, and a mention list that does not fit is split across messages, repeating the
+title of the section at the top of the next message so every message can be read on its own.
+"""
+
+import discord
+from typing import Hashable, List, Tuple
+
+# The maximum length of a Discord message
+MESSAGE_LIMIT = 2000
+
+# Announcements only ever ping the users they mention, never roles or everyone
+ANNOUNCEMENT_ALLOWED_MENTIONS = discord.AllowedMentions(
+    everyone=False, users=True, roles=False, replied_user=False
+)
+
+
+class AnnouncementBuilder:
+    def __init__(self, header: str, limit: int = MESSAGE_LIMIT):
+        self.header = header
+        self.limit = limit
+        # (content, keys of the sections that end in the message)
+        self._messages: List[Tuple[str, List[Hashable]]] = []
+        self._content = header
+        self._keys: List[Hashable] = []
+
+    def add_section(self, key: Hashable, title: str, mentions: List[str]) -> None:
+        """
+        Add a section to the announcement.
+
+        Parameters:
+        key (Hashable): Identifies the section, it is returned with the message the section ends in.
+        title (str): The title line of the section.
+        mentions (List[str]): The mentions listed under the title, separated by commas.
+        """
+        title = f"\n{title}\n\n"
+        first_line = (mentions[0] if mentions else "") + "\n"
+        # Start a new message if the section cannot even begin in the current one
+        if not self._fits(title + first_line) and self._keys:
+            self._flush()
+
+        self._content += title
+        line = ""
+        for mention in mentions:
+            addition = f", {mention}" if line else mention
+            if not self._fits(addition + "\n"):
+                # Continue the mention list in the next message, under the same title
+                self._content += "\n"
+                self._flush()
+                self._content += title
+                line, addition = "", mention
+            self._content += addition
+            line += addition
+
+        self._content += "\n"
+        self._keys.append(key)
+
+    def build(self) -> List[Tuple[str, List[Hashable]]]:
+        """
+        Get the messages of the announcement.
+
+        Returns:
+        List[Tuple[str, List[Hashable]]]: The content of each message, and the keys of the sections that end in it.
+        """
+        if self._keys:
+            self._flush()
+        return self._messages
+
+    def _fits(self, text: str) -> bool:
+        return len(self._content) + len(text) <= self.limit
+
+    def _flush(self) -> None:
+        self._messages.append((self._content, self._keys))
+        self._content = self.header
+        self._keys = []
@@ -0,0 +1,108 @@
+"""
+events/announcements.py contains the EventAnnouncer, which announces newly created scheduled events once
+EVENT_ANNOUNCEMENT_DELAY has passed, giving the creator time to finish editing the event.
+
+Pending announcements are persisted in the store and driven by a single DeadlineScheduler, so no coroutine
+sleeps per event and announcements resume after a restart. There is at most one announcement per event:
+creating the same event again keeps its original due time, edits are picked up because the event is fetched
+again when it is announced, and deleting or cancelling the event drops its announcement.
+"""
+
+import time
+import discord
+import config.config as cfg
+from discord.ext import commands
+from typing import Dict, Tuple
+from logger.logger import logger
+from events.event_operations import announce_new_event
+from tasks.scheduler import DeadlineScheduler
+
+# How long to wait before retrying an announcement that failed
+ANNOUNCEMENT_RETRY_DELAY = 5 * 60
+
+
+class EventAnnouncer:
+    def __init__(self, bot: commands.Bot, delay: float = cfg.EVENT_ANNOUNCEMENT_DELAY):
+        self.bot = bot
+        self.store = bot.store
+        self.delay = delay
+        self.scheduler = DeadlineScheduler(self._announce, "event announcement")
+
+        # event ID -> (guild ID, due time), of the guilds on the shards of this process
+        self.jobs: Dict[int, Tuple[int, float]] = {
+            event_id: (guild_id, due)
+            for event_id, (guild_id, due) in self.store.load_announcement_jobs().items()
+            if bot.shard_partition.owns_guild(guild_id)
+        }
+        for event_id, (_, due) in self.jobs.items():
+            self.scheduler.schedule(event_id, due)
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self.jobs
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def start(self) -> None:
+        self.scheduler.start()
+
+    async def stop(self) -> None:
+        await self.scheduler.stop()
+
+    def schedule(self, event: discord.ScheduledEvent) -> None:
+        """
+        Schedule the announcement of a newly created event. Events that already have one keep it.
+
+        Parameters:
+        event (discord.ScheduledEvent): The event that was created.
+        """
+        if event.id in self.jobs:
+            return
+
+        due = time.time() + self.delay
+        self.jobs[event.id] = (event.guild_id, due)
+        self.store.save_announcement_job(event.id, event.guild_id, due)
+        self.scheduler.schedule(event.id, due)
+
+    def cancel(self, event_id: int) -> None:
+        """
+        Drop the pending announcement of an event, if it has one.
+
+        Parameters:
+        event_id (int): The ID of the event.
+        """
+        if self.jobs.pop(event_id, None) is not None:
+            self.scheduler.cancel(event_id)
+            self.store.remove_announcement_job(event_id)
+
+    async def _announce(self, event_id: int) -> None:
+        await self.bot.wait_until_ready()
+
+        job = self.jobs.get(event_id)
+        if job is None:
+            return
+
+        guild_id, _ = job
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            logger.info(
+                f"Guild {guild_id} not found, dropping the announcement of event {event_id}"
+            )
+            self.cancel(event_id)
+            return
+
+        try:
+            await announce_new_event(guild, event_id)
+        except discord.NotFound:
+            logger.info(f"Event {event_id} no longer exists, dropping its announcement")
+        except discord.HTTPException as e:
+            logger.error(
+                f"Unable to announce event {event_id}, retrying later. Error: {e}"
+            )
+            due = time.time() + ANNOUNCEMENT_RETRY_DELAY
+            self.jobs[event_id] = (guild_id, due)
+            self.store.save_announcement_job(event_id, guild_id, due)
+            self.scheduler.schedule(event_id, due)
+            return
+
+        self.cancel(event_id)
@@ -0,0 +1,180 @@
+"""
+events/event_index.py contains the ScheduledEventIndex, which serves the scheduled events of a single guild from
+the gateway cache instead of the REST API.
+
+Only events that are scheduled or active are indexed, an event that is canceled or has completed is dropped.
+Events are kept sorted by start time, so the events starting in a time window are found with a binary search,
+and are indexed by name, so looking an event up by name is a dictionary lookup. Names are also kept in a prefix
+index, which answers the event name autocomplete.
+Indexes are built lazily from guild.scheduled_events and kept current by the scheduled event listeners in
+cogs/events.py. They are dropped when a guild becomes available again, as events may have been missed in between.
+"""
+
+import bisect
+import discord
+from typing import Dict, List, Optional, Tuple
+from helpers.prefix_index import AUTOCOMPLETE_LIMIT, PrefixIndex
+
+# The statuses of the events that are indexed
+LIVE_STATUSES = (discord.EventStatus.scheduled, discord.EventStatus.active)
+
+
+class ScheduledEventIndex:
+    def __init__(self, guild: discord.Guild):
+        self.events: Dict[int, discord.ScheduledEvent] = {}
+        # event ID -> (start timestamp, name) the event was indexed under, as discord.py updates cached events in place
+        self._keys: Dict[int, Tuple[float, str]] = {}
+        # (start timestamp, event ID), sorted
+        self._by_start: List[Tuple[float, int]] = []
+        # event name -> IDs of the events with that name, oldest first
+        self._by_name: Dict[str, List[int]] = {}
+        self._name_prefixes = PrefixIndex()
+
+        for event in guild.scheduled_events:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, event: discord.ScheduledEvent) -> None:
+        """
+        Add an event to the index, or update it if it is already indexed. An event that is canceled or has
+        completed is removed instead.
+
+        Parameters:
+        event (discord.ScheduledEvent): The event.
+        """
+        if event.id in self.events:
+            self.remove(event.id)
+        if event.status not in LIVE_STATUSES:
+            return
+
+        start = event.start_time.timestamp()
+        self.events[event.id] = event
+        self._keys[event.id] = (start, event.name)
+        bisect.insort(self._by_start, (start, event.id))
+        self._by_name.setdefault(event.name, []).append(event.id)
+        self._name_prefixes.add(event.name, event.id)
+
+    def remove(self, event_id: int) -> None:
+        """
+        Remove an event from the index. Removing an unknown event is a no-op.
+
+        Parameters:
+        event_id (int): The ID of the event.
+        """
+        if self.events.pop(event_id, None) is None:
+            return
+
+        start, name = self._keys.pop(event_id)
+        entry = (start, event_id)
+        position = bisect.bisect_left(self._by_start, entry)
+        if position < len(self._by_start) and self._by_start[position] == entry:
+            del self._by_start[position]
+
+        event_ids = self._by_name[name]
+        event_ids.remove(event_id)
+        if not event_ids:
+            del self._by_name[name]
+        self._name_prefixes.remove(name, event_id)
+
+    def starting_between(
+        self, start: float, end: float
+    ) -> List[discord.ScheduledEvent]:
+        """
+        Get the events that start within a time window, in order of start time.
+
+        Parameters:
+        start (float): The UNIX timestamp the window starts at, inclusive.
+        end (float): The UNIX timestamp the window ends at, inclusive.
+
+        Returns:
+        List[discord.ScheduledEvent]: The events starting within the window.
+        """
+        low = bisect.bisect_left(self._by_start, (start, float("-inf")))
+        high = bisect.bisect_right(self._by_start, (end, float("inf")))
+        return [self.events[event_id] for _, event_id in self._by_start[low:high]]
+
+    def get_by_name(self, name: str) -> Optional[discord.ScheduledEvent]:
+        """
+        Get an event by name. If several events share the name, the one indexed first is returned.
+
+        Parameters:
+        name (str): The name of the event.
+
+        Returns:
+        Optional[discord.ScheduledEvent]: The event, or None if there is none with that name.
+        """
+        event_ids = self._by_name.get(name)
+        return self.events[event_ids[0]] if event_ids else None
+
+    def search_names(
+        self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT
+    ) -> List[discord.ScheduledEvent]:
+        """
+        Find the events whose name starts with a prefix, ignoring case.
+
+        Parameters:
+        prefix (str): The prefix of the name.
+        limit (int): The maximum number of events to return.
+
+        Returns:
+        List[discord.ScheduledEvent]: The matching events, in order of name.
+        """
+        return [
+            self.events[event_id]
+            for event_id in self._name_prefixes.search(prefix, limit)
+        ]
+
+
+_event_indexes: Dict[int, ScheduledEventIndex] = {}
+
+
+def get_event_index(guild: discord.Guild) -> ScheduledEventIndex:
+    """
+    Get the scheduled event index of a guild, building it if necessary.
+
+    Parameters:
+    guild (discord.Guild): The guild.
+
+    Returns:
+    ScheduledEventIndex: The scheduled event index of the guild.
+    """
+    event_index = _event_indexes.get(guild.id)
+    if event_index is None:
+        event_index = _event_indexes[guild.id] = ScheduledEventIndex(guild)
+    return event_index
+
+
+def index_event(event: discord.ScheduledEvent) -> None:
+    """
+    Add or update an event in the index of its guild, if that index has been built.
+
+    Parameters:
+    event (discord.ScheduledEvent): The event that was created or updated.
+    """
+    event_index = _event_indexes.get(event.guild_id)
+    if event_index is not None:
+        event_index.add(event)
+
+
+def unindex_event(event: discord.ScheduledEvent) -> None:
+    """
+    Remove an event from the index of its guild, if that index has been built.
+
+    Parameters:
+    event (discord.ScheduledEvent): The event that was deleted.
+    """
+    event_index = _event_indexes.get(event.guild_id)
+    if event_index is not None:
+        event_index.remove(event.id)
+
+
+def invalidate_event_index(guild_id: int) -> None:
+    """
+    Drop the scheduled event index of a guild, it is rebuilt on the next lookup.
+
+    Parameters:
+    guild_id (int): The ID of the guild.
+    """
+    _event_indexes.pop(guild_id, None)
@@ -1,13 +1,10 @@
 """
 events/event_operations.py is responsible for handling the business logic associated with events
-This includes fetching events, loading posted events, saving posted events, notifying guild of new events, and more 
+This includes fetching events, notifying guild of new events, and more 
 """
 
 
-import json
-import requests
-import asyncio
-import os
+import time
 import discord
 from consts.constants import (
     GENERAL_CHANNEL,
@@ -16,40 +13,24 @@ from consts.constants import (
     COLLAB_LAND_CHANNEL,
     START_HERE_CHANNEL,
 )
-from config.config import POSTED_EVENTS_FILE_PATH
-from helpers.helpers import get_channel_by_name, send_dm_once
+from helpers.helpers import get_channel_by_name, get_member
+from helpers.http_client import DiscordRESTClient
+from events.event_index import get_event_index
+from helpers.contributor_index import ContributorRegistry
 from datetime import datetime, timezone
 from typing import List, Optional, Any, Dict, Union
-from discord import ScheduledEvent, Reaction, User, Message
+from discord import ScheduledEvent, Message
 from discord.utils import get
 from discord.ext.commands import Bot
 from discord.ext import commands
 from logger.logger import logger
 
 
-# Save the posted events to the JSON file
-def save_posted_events(posted_events: List[int]) -> None:
-    """
-    Save the posted event IDs to the JSON file.
-
-    Parameters:
-    posted_events (List[int]): The list of event IDs that have already been posted to Discord.
-    """
-    try:
-        logger.info(f"Saving events to: {POSTED_EVENTS_FILE_PATH}")
-
-        with open(POSTED_EVENTS_FILE_PATH, "w") as file:
-            json.dump(posted_events, file)
-
-    except Exception as e:
-        logger.error(f"Error saving posted events: {e}")
-
-
 # Format the event message and send it to the channel
 def format_event(event: ScheduledEvent, guild_id: int) -> str:
     """
     Formats the event message and returns it.
-    invoked by notify_new_event
+    invoked by announce_new_event
 
     Parameters:
     event (ScheduledEvent): The event to be formatted.
@@ -75,7 +56,8 @@ def format_event(event: ScheduledEvent, guild_id: int) -> str:
 # NOTE: For some reason it doesn't appear that you can access the userIDs interested
 # in a scheduled event. It's either a count, or a boolean.
 # performing a GET request, however, does allow this.
-def get_guild_scheduled_event_users(
+async def get_guild_scheduled_event_users(
+    client: DiscordRESTClient,
     guild_id: int,
     scheduled_event_id: int,
     limit: int = 100,
@@ -87,18 +69,18 @@ def get_guild_scheduled_event_users(
     Get the users interested in a scheduled event.
 
     Parameters:
+    client (DiscordRESTClient): The pooled REST client used to perform the request.
     guild_id (int): The ID of the guild in which the event was created.
     scheduled_event_id (int): The ID of the event.
     limit (int): The maximum number of users to be returned.
-    NOTE: The remaining below are optional parameters, that we may wish to use in the future.
     with_member (bool): Whether to include the member object in the response.
     before (Optional[str]): The ID of the user to be used as the upper limit.
-    after (Optional[str]): The ID of the user to be used as the lower limit.
+    after (Optional[str]): The ID of the user to be used as the lower limit, used by the InterestRoster to paginate.
 
     Returns:
     Optional[List[Any]]: The list of users interested in the event.
     """
-    url = f"https://discord.com/api/v10/guilds/{guild_id}/scheduled-events/{scheduled_event_id}/users"
+    route = f"/guilds/{guild_id}/scheduled-events/{scheduled_event_id}/users"
 
     params = {
         "limit": limit,
@@ -107,73 +89,58 @@ def get_guild_scheduled_event_users(
         "after": after,
     }
 
-    headers = {"Authorization": f'Bot {os.getenv("DISCORD_BOT_TOKEN")}'}
-
-    response = requests.get(url, params=params, headers=headers)
-
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Error: {response.status_code} - {response.text}")
-        return None
+    return await client.get_json(route, params)
 
 
-# Notify the channel about the newly created event after a short delay
-async def notify_new_event(bot: Bot, event: ScheduledEvent, guild_id: int) -> None:
+# Announce a newly created event, this is called by the EventAnnouncer once its delay has passed
+async def announce_new_event(guild: discord.Guild, event_id: int) -> None:
     """
-    Notify the General channel about the newly created event after a short delay.
-    Fetches and formats the event before posting it.
+    Announce a newly created event in the General channel.
+    The event is fetched again first, so the announcement reflects any edits made since it was created.
 
     Parameters:
-    bot (Bot): The bot instance.
-    event (ScheduledEvent): The event that was created.
-    guild_id (int): The ID of the guild in which the event was created.
-    """
-
-    guild = bot.get_guild(guild_id)
+    guild (discord.Guild): The guild in which the event was created.
+    event_id (int): The ID of the event.
 
-    if guild:
-        # Wait for 30 mins before sending the notification
-        await asyncio.sleep(30 * 60)
+    Raises:
+    discord.NotFound: If the event has been deleted.
+    discord.HTTPException: If fetching the event or sending the announcement failed.
+    """
+    event = await guild.fetch_scheduled_event(event_id)
+    if event.status not in (
+        discord.EventStatus.scheduled,
+        discord.EventStatus.active,
+    ):
+        logger.info(f"Not announcing event {event.name}, it is {event.status.name}")
+        return
 
-        # Fetch the event again to get the updated details
-        event = await guild.fetch_scheduled_event(event.id)
-        formatted_event = format_event(event, guild_id)
+    formatted_event = format_event(event, guild.id)
 
-        try:
-            channel = get_channel_by_name(guild, GENERAL_CHANNEL)
-            # Send the notification and capture the Message object
-            await channel.send(f"🌺 **__Newly Created Event__** 🌺 \n{formatted_event}")
-        except ValueError as e:
-            logger.error(f"Cannot post newly created event to Discord, Error: {e}")
-            return
+    try:
+        channel = get_channel_by_name(guild, GENERAL_CHANNEL)
+    except ValueError as e:
+        logger.error(f"Cannot post newly created event to Discord, Error: {e}")
+        return
 
-    else:
-        logger.info(f"Guild not found")
+    await channel.send(f"🌺 **__Newly Created Event__** 🌺 \n{formatted_event}")
 
 
-# Fetch all upcoming events within the next 24 hours this is called by tasks.py
-async def fetch_upcoming_events(guild):
+# Get all upcoming events within the next 24 hours this is called by tasks.py
+def get_upcoming_events(guild: discord.Guild) -> List[ScheduledEvent]:
     """
-    Fetches all upcoming events within the next 24 hours.
+    Gets all upcoming events within the next 24 hours from the scheduled event index of the guild.
 
     Parameters:
     guild (Guild): The guild for which the events are to be fetched.
 
     Returns:
-    List[ScheduledEvent]: The list of upcoming events.
+    List[ScheduledEvent]: The list of upcoming events, in order of start time.
 
     """
-    current_time = datetime.now().astimezone(timezone.utc)
-    events = await guild.fetch_scheduled_events()
-    upcoming_events = []
-
-    for event in events:
-        time_difference = event.start_time - current_time
-        if 0 <= time_difference.total_seconds() <= 24 * 3600:
-            upcoming_events.append(event)
-
-    return upcoming_events
+    current_time = time.time()
+    return get_event_index(guild).starting_between(
+        current_time, current_time + 24 * 3600
+    )
 
 
 async def process_new_member(member: discord.Member) -> None:
@@ -206,17 +173,19 @@ async def process_new_member(member: discord.Member) -> None:
 
 
 async def handle_message(
-    bot: commands.Bot, message: discord.Message, emoji_dicts: Dict[str, Dict[str, str]]
+    bot: commands.Bot,
+    message: discord.Message,
+    contributors: ContributorRegistry,
 ) -> None:
     """
     Handles a new message in the server.
-    If a contributors emoji is found, a DM is sent to them.
+    If a contributors emoji is found, a DM to them is queued.
 
 
     Parameters:
         bot (commands.Bot): The bot instance.
         message (Message): The new message.
-        emoji_dicts (Dict[str, Dict[str, str]]): The dictionary of emoji to user mappings for each server.
+        contributors (ContributorRegistry): The contributor index of each guild.
 
     """
     if message.content.lower().startswith(".update_commands"):
@@ -227,72 +196,46 @@ async def handle_message(
         except Exception as e:
             logger.error(f"Error updating commands: {e}")
 
-    # Ignore messages from the bot itself
-    if message.author == bot.user:
+    # Ignore messages from the bot itself, and direct messages
+    if message.author == bot.user or message.guild is None:
         return
 
-    server_name = message.guild.name
-    emoji_dict = emoji_dicts[server_name]
+    contributor_index = contributors.get(message.guild)
 
-    # Check if any emoji in the message matches an emoji in the emoji dictionary
-    for emoji_id, user_id in emoji_dict.items():
-        if emoji_id in message.content:
-            if str(user_id) != str(message.author.id):
-                try:
-                    logger.info(f"Messaging the user, {user_id}")
-                    message_link = message.jump_url
-                    user = await bot.fetch_user(int(user_id))
-                    if user:
-                        await send_dm_once(bot, user, message_link)
-                except discord.errors.NotFound:
-                    logger.warning(f"User not found: {user_id}")
+    # Find every contributor emoji in the message in a single scan
+    for emoji_id, user_id in contributor_index.find_mentions(message.content):
+        if str(user_id) != str(message.author.id):
+            logger.info(f"Messaging the user, {user_id}")
+            bot.dm_queue.enqueue(int(user_id), message.guild, message.jump_url)
 
 
 async def handle_reaction(
     bot: commands.Bot,
-    reaction: Reaction,
-    user: User,
-    emoji_dicts: Dict[str, Dict[str, str]],
+    payload: discord.RawReactionActionEvent,
+    contributors: ContributorRegistry,
 ) -> None:
     """
     Handles a new reaction in the server.
-    If a contributors emoji is found, a DM is sent to them.
+    If a contributors emoji is found, a DM to them is queued.
+    The raw reaction payload is used, so reactions on messages that are not in the message cache are handled too.
 
     Parameters:
     bot (commands.Bot): The bot instance
-    reaction (Reaction): The new reaction
-    user (User): The user who added the reaction
-    emoji_dicts (Dict[str, Dict[str, str]]): The dictionary of emoji to user mappings for each server.
+    payload (discord.RawReactionActionEvent): The payload of the new reaction
+    contributors (ContributorRegistry): The contributor index of each guild.
     """
-    # Get the server name from the reaction
-    server_name = reaction.message.guild.name
-
-    # Get emoji dictionary and contributors for the server
-    server_emoji_dict = emoji_dicts.get(server_name)
-
-    if not server_emoji_dict:
-        logger.warning(f"No emoji dictionary found for the server: {server_name}")
+    # Ignore reactions in direct messages
+    guild = bot.get_guild(payload.guild_id) if payload.guild_id else None
+    if guild is None:
         return
 
-    contributor_emoji = next(
-        (
-            emoji_id
-            for emoji_id, contributor_uid in server_emoji_dict.items()
-            if str(reaction.emoji) == emoji_id
-        ),
-        None,
-    )
+    # Get the contributor index for the guild
+    contributor_index = contributors.get(guild)
 
-    if contributor_emoji:
-        contributor_uid = server_emoji_dict.get(contributor_emoji)
-        if contributor_uid and str(contributor_uid) != str(user.id):
-            message_link = reaction.message.jump_url
-            try:
-                contributor_user = await bot.fetch_user(int(contributor_uid))
-                if contributor_user:
-                    await send_dm_once(bot, contributor_user, message_link)
-            except discord.errors.NotFound:
-                logger.warning(f"User not found: {contributor_uid}")
+    contributor_uid = contributor_index.get_uid(str(payload.emoji))
+    if contributor_uid and str(contributor_uid) != str(payload.user_id):
+        jump_url = f"https://discord.com/channels/{guild.id}/{payload.channel_id}/{payload.message_id}"
+        bot.dm_queue.enqueue(int(contributor_uid), guild, jump_url)
 
 
 async def process_reaction_add(bot, payload):
@@ -306,7 +249,8 @@ async def process_reaction_add(bot, payload):
     # If the reaction is on the rules message, process the reaction
     if payload.message_id == RULES_MESSAGE_ID:
         guild = bot.get_guild(payload.guild_id)
-        member = guild.get_member(payload.user_id)
+        # The member is part of the payload, so the member cache is not needed
+        member = payload.member or await get_member(guild, payload.user_id)
 
         # If the reaction emoji is "🌺", add the "bloomer" role to the member
         if payload.emoji.name == "🌺":
@@ -0,0 +1,190 @@
+"""
+events/interest_roster.py contains the InterestRoster, which keeps the IDs of the users interested in each
+scheduled event, so announcements can mention all of them without a REST call.
+
+The roster of an event is seeded once from the REST API, paginating with the after cursor so events with any
+number of interested users are covered, and is then maintained from the scheduled event user add and remove
+listeners in cogs/events.py. Rosters are persisted in the store. As users may have changed their interest while
+the bot was offline, the rosters of a guild are seeded again in the background whenever it becomes available.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+from events.event_operations import get_guild_scheduled_event_users
+from helpers.http_client import DiscordRESTClient
+from logger.logger import logger
+from storage.storage import Store
+
+# The maximum number of users the API returns per page
+PAGE_SIZE = 100
+
+
+class InterestRoster:
+    def __init__(self, store: Store, rest_client: DiscordRESTClient):
+        self.store = store
+        self.rest_client = rest_client
+        # event ID -> IDs of the interested users, for the events whose roster has been seeded
+        self.rosters: Dict[int, Set[int]] = {}
+        # event ID -> guild ID
+        self.guild_ids: Dict[int, int] = {}
+        # event ID -> the seeding in progress
+        self._seeding: Dict[int, asyncio.Task] = {}
+        # event ID -> (user ID, interested) changes received while the roster was being seeded
+        self._changes: Dict[int, List[Tuple[int, bool]]] = {}
+
+        for event_id, (guild_id, user_ids) in store.load_event_rosters().items():
+            self.rosters[event_id] = user_ids
+            self.guild_ids[event_id] = guild_id
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self.rosters
+
+    async def get(self, guild_id: int, event_id: int) -> Optional[Set[int]]:
+        """
+        Get the IDs of the users interested in an event, seeding its roster first if necessary.
+
+        Parameters:
+        guild_id (int): The ID of the guild of the event.
+        event_id (int): The ID of the event.
+
+        Returns:
+        Optional[Set[int]]: The IDs of the interested users, or None if the roster could not be seeded.
+        """
+        if event_id in self.rosters and event_id not in self._seeding:
+            return set(self.rosters[event_id])
+        return await self.seed(guild_id, event_id)
+
+    async def seed(self, guild_id: int, event_id: int) -> Optional[Set[int]]:
+        """
+        Seed the roster of an event from the REST API. Concurrent calls for the same event share a single seeding.
+
+        Parameters:
+        guild_id (int): The ID of the guild of the event.
+        event_id (int): The ID of the event.
+
+        Returns:
+        Optional[Set[int]]: The IDs of the interested users. If seeding failed, the previous roster, or None if there is none.
+        """
+        task = self._seeding.get(event_id) or self._start_seeding(guild_id, event_id)
+
+        try:
+            user_ids = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The event was forgotten while it was being seeded
+            if not task.cancelled():
+                raise
+            return None
+
+        if user_ids is None:
+            roster = self.rosters.get(event_id)
+            return set(roster) if roster is not None else None
+        return set(user_ids)
+
+    def refresh_guild(self, guild_id: int) -> None:
+        """
+        Seed the rosters of every event of a guild again in the background.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        """
+        for event_id, event_guild_id in list(self.guild_ids.items()):
+            if event_guild_id == guild_id and event_id not in self._seeding:
+                self._start_seeding(guild_id, event_id)
+
+    def add(self, event_id: int, user_id: int) -> None:
+        """
+        Record that a user is interested in an event.
+
+        Parameters:
+        event_id (int): The ID of the event.
+        user_id (int): The ID of the user.
+        """
+        self._apply(event_id, user_id, True)
+
+    def remove(self, event_id: int, user_id: int) -> None:
+        """
+        Record that a user is no longer interested in an event.
+
+        Parameters:
+        event_id (int): The ID of the event.
+        user_id (int): The ID of the user.
+        """
+        self._apply(event_id, user_id, False)
+
+    def forget(self, event_id: int) -> None:
+        """
+        Drop the roster of an event, for when the event is deleted or over.
+
+        Parameters:
+        event_id (int): The ID of the event.
+        """
+        task = self._seeding.pop(event_id, None)
+        if task is not None:
+            task.cancel()
+        self._changes.pop(event_id, None)
+        self.guild_ids.pop(event_id, None)
+        if self.rosters.pop(event_id, None) is not None:
+            self.store.remove_event_roster(event_id)
+
+    def _start_seeding(self, guild_id: int, event_id: int) -> asyncio.Task:
+        self._changes[event_id] = []
+        task = self._seeding[event_id] = asyncio.create_task(
+            self._seed(guild_id, event_id)
+        )
+
+        def done(_: asyncio.Task) -> None:
+            if self._seeding.get(event_id) is task:
+                del self._seeding[event_id]
+
+        task.add_done_callback(done)
+        return task
+
+    def _apply(self, event_id: int, user_id: int, interested: bool) -> None:
+        # Changes made while seeding are replayed on top of the seeded roster
+        if event_id in self._seeding:
+            self._changes.setdefault(event_id, []).append((user_id, interested))
+
+        roster = self.rosters.get(event_id)
+        if roster is None:
+            # The roster is seeded on first use, which picks this change up
+            return
+
+        if interested and user_id not in roster:
+            roster.add(user_id)
+            self.store.add_event_interest(event_id, user_id)
+        elif not interested and user_id in roster:
+            roster.discard(user_id)
+            self.store.remove_event_interest(event_id, user_id)
+
+    async def _seed(self, guild_id: int, event_id: int) -> Optional[Set[int]]:
+        user_ids: Set[int] = set()
+        after = None
+
+        while True:
+            users = await get_guild_scheduled_event_users(
+                self.rest_client, guild_id, event_id, limit=PAGE_SIZE, after=after
+            )
+            if users is None:
+                logger.error(f"Unable to seed the interest roster of event {event_id}")
+                self._changes.pop(event_id, None)
+                return None
+
+            user_ids.update(int(user["user"]["id"]) for user in users)
+            if len(users) < PAGE_SIZE:
+                break
+            # Pages are ordered by user ID when paginating forwards
+            after = max(int(user["user"]["id"]) for user in users)
+
+        for user_id, interested in self._changes.pop(event_id, []):
+            if interested:
+                user_ids.add(user_id)
+            else:
+                user_ids.discard(user_id)
+
+        self.rosters[event_id] = user_ids
+        self.guild_ids[event_id] = guild_id
+        self.store.replace_event_roster(event_id, guild_id, user_ids)
+        logger.info(
+            f"Seeded the interest roster of event {event_id} with {len(user_ids)} users"
+        )
+        return user_ids
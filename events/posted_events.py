@@ -0,0 +1,97 @@
+"""
+events/posted_events.py contains the PostedEventsRegistry, which tracks the scheduled events that have
+already been announced to Discord.
+
+Event IDs are kept in a dictionary alongside the event's start and end time, so membership checks are
+O(1), and events are pruned once they are over. Changes are buffered and written to the store in a single
+transaction when flush is called, instead of once per event.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+from discord import ScheduledEvent
+from logger.logger import logger
+from storage.storage import Store
+
+# Events are announced at most 24 hours before they start. An entry without a known end time, such as one
+# migrated from posted_events.json, is therefore safe to prune 24 hours after it was loaded.
+UNKNOWN_END_TIME_GRACE = 24 * 3600
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+class PostedEventsRegistry:
+    def __init__(self, store: Store):
+        self.store = store
+        self.events: Dict[int, Tuple[Optional[float], float]] = {}
+        self._added: Set[int] = set()
+        self._removed: Set[int] = set()
+
+        now = time.time()
+        for event_id, (start_time, end_time) in store.load_posted_events().items():
+            if end_time is None:
+                end_time = now + UNKNOWN_END_TIME_GRACE
+                self._added.add(event_id)
+            self.events[event_id] = (start_time, end_time)
+
+    def __contains__(self, event_id: int) -> bool:
+        return event_id in self.events
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, event: ScheduledEvent) -> None:
+        """
+        Mark an event as posted. The change is persisted on the next flush.
+
+        Parameters:
+        event (ScheduledEvent): The event that was posted.
+        """
+        start_time = event.start_time.timestamp()
+        # Events without an end time are considered over once they have started
+        end_time = _timestamp(event.end_time) or start_time
+        self.events[event.id] = (start_time, end_time)
+        self._added.add(event.id)
+        self._removed.discard(event.id)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Remove the events that are over. The change is persisted on the next flush.
+
+        Parameters:
+        now (Optional[float]): The current time, defaults to time.time().
+
+        Returns:
+        int: The number of events that were pruned.
+        """
+        now = time.time() if now is None else now
+        expired = [
+            event_id
+            for event_id, (_, end_time) in self.events.items()
+            if end_time < now
+        ]
+        for event_id in expired:
+            del self.events[event_id]
+            self._added.discard(event_id)
+            self._removed.add(event_id)
+
+        if expired:
+            logger.info(f"Pruned {len(expired)} posted events that are over")
+        return len(expired)
+
+    def flush(self) -> None:
+        """
+        Persist the changes made since the last flush in a single transaction.
+        """
+        if not self._added and not self._removed:
+            return
+
+        self.store.save_posted_events(
+            {event_id: self.events[event_id] for event_id in self._added},
+            self._removed,
+        )
+        self._added.clear()
+        self._removed.clear()
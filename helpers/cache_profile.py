@@ -0,0 +1,108 @@
+"""
+helpers/cache_profile.py builds the gateway cache settings of the bot from the [CACHE] section of config.ini.
+
+A profile sets chunk_guilds_at_startup, the member cache flags and max_messages at once, and each of them can be
+overridden on its own:
+- full: discord.py's defaults, and the shipped profile. Every member of every guild is requested at startup and
+  kept, and the last 1000 messages are cached.
+- lean: members are only cached once they have been seen, and a member lookup that misses requests only that
+  member, see get_member in helpers/helpers.py. No messages are cached, as the listeners only need raw reaction
+  payloads. discord.py only dispatches scheduled_event_user_add and scheduled_event_user_remove for users it has
+  cached, so with this profile the interest rosters in events/interest_roster.py miss the changes of uncached users
+  until a guild's rosters are seeded again from the API.
+
+report_ready logs the profile, time-to-ready, cache sizes and peak resident memory of the process as a single line
+of key=value pairs, so the reports of the profiles can be compared line by line.
+"""
+
+import time
+import discord
+import config.config as cfg
+from discord.ext import commands
+from typing import Any, Dict
+from logger.logger import logger
+
+try:
+    import resource
+except ImportError:  # resource is only available on Unix
+    resource = None
+
+CACHE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "full": {
+        "chunk_guilds_at_startup": True,
+        "member_cache": "all",
+        "max_messages": 1000,
+    },
+    "lean": {
+        "chunk_guilds_at_startup": False,
+        "member_cache": "joined",
+        "max_messages": 0,
+    },
+}
+
+MEMBER_CACHE_FLAGS = {
+    "all": discord.MemberCacheFlags.all,
+    "joined": lambda: discord.MemberCacheFlags(joined=True, voice=False),
+    "none": discord.MemberCacheFlags.none,
+}
+
+
+def cache_options(profile: str = cfg.CACHE_PROFILE) -> Dict[str, Any]:
+    """
+    Get the keyword arguments of commands.Bot for a cache profile, with the overrides from config.ini applied.
+
+    Parameters:
+    profile (str): The name of the profile, full or lean.
+
+    Returns:
+    Dict[str, Any]: The chunk_guilds_at_startup, member_cache_flags and max_messages arguments.
+
+    Raises:
+    ValueError: If the profile or the member cache setting is unknown.
+    """
+    if profile not in CACHE_PROFILES:
+        raise ValueError(f"Unknown cache profile: {profile}")
+
+    settings = dict(CACHE_PROFILES[profile])
+    overrides = {
+        "chunk_guilds_at_startup": cfg.CACHE_CHUNK_GUILDS_AT_STARTUP,
+        "member_cache": cfg.CACHE_MEMBER_CACHE,
+        "max_messages": cfg.CACHE_MAX_MESSAGES,
+    }
+    settings.update(
+        {name: value for name, value in overrides.items() if value is not None}
+    )
+
+    if settings["member_cache"] not in MEMBER_CACHE_FLAGS:
+        raise ValueError(f"Unknown member cache setting: {settings['member_cache']}")
+
+    return {
+        "chunk_guilds_at_startup": settings["chunk_guilds_at_startup"],
+        "member_cache_flags": MEMBER_CACHE_FLAGS[settings["member_cache"]](),
+        # discord.py disables the message cache with None
+        "max_messages": settings["max_messages"] or None,
+    }
+
+
+def report_ready(
+    bot: commands.Bot, started_at: float, profile: str = cfg.CACHE_PROFILE
+) -> None:
+    """
+    Log the time it took the bot to become ready, the size of its caches, and the peak resident memory of the process.
+
+    Parameters:
+    bot (commands.Bot): The bot instance.
+    started_at (float): The time.monotonic() at which the bot started connecting.
+    profile (str): The name of the cache profile in use.
+    """
+    time_to_ready = time.monotonic() - started_at
+    members = sum(len(guild.members) for guild in bot.guilds)
+    max_rss = "n/a"
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux
+        max_rss = f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MiB"
+
+    logger.info(
+        f"Cache profile report: profile={profile} time_to_ready={time_to_ready:.1f}s max_rss={max_rss} "
+        f"guilds={len(bot.guilds)} members={members} messages={len(bot.cached_messages)}"
+    )
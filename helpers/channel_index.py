@@ -0,0 +1,83 @@
+"""
+helpers/channel_index.py contains the ChannelIndex, which maps channel names to channels for a single guild.
+
+Text and forum channels are indexed separately, and the fallback mapping from consts/constants.py is resolved
+once when the index is built, so looking a channel up by name is a dictionary lookup.
+Indexes are built lazily and dropped whenever a channel in the guild is created, updated or deleted,
+see the channel listeners in cogs/events.py.
+"""
+
+import discord
+import consts.constants as constants
+from typing import Dict, Optional, Type
+
+
+class ChannelIndex:
+    def __init__(self, guild: discord.Guild):
+        self.channels: Dict[
+            Type[discord.abc.GuildChannel], Dict[str, discord.abc.GuildChannel]
+        ] = {
+            discord.TextChannel: {},
+            discord.ForumChannel: {},
+        }
+
+        for channel in guild.channels:
+            channels_by_name = self.channels.get(type(channel))
+            # Keep the first channel with a given name, as a linear search would
+            if channels_by_name is not None:
+                channels_by_name.setdefault(channel.name, channel)
+
+        # Resolve the fallback mapping up front, against the real channel names only
+        fallback_mapping = constants.CONSTANT_FALLBACK_MAPPING
+        for channels_by_name in self.channels.values():
+            fallbacks = {
+                channel_name: channels_by_name[fallback_channel_name]
+                for channel_name, fallback_channel_name in fallback_mapping.items()
+                if channel_name not in channels_by_name
+                and fallback_channel_name in channels_by_name
+            }
+            channels_by_name.update(fallbacks)
+
+    def get(
+        self, channel_type: Type[discord.abc.GuildChannel], channel_name: str
+    ) -> Optional[discord.abc.GuildChannel]:
+        """
+        Get a channel of the given type by name, or by its fallback name.
+
+        Parameters:
+        channel_type (Type[discord.abc.GuildChannel]): discord.TextChannel or discord.ForumChannel.
+        channel_name (str): The name of the channel.
+
+        Returns:
+        Optional[discord.abc.GuildChannel]: The matching channel, or None if there is none.
+        """
+        return self.channels[channel_type].get(channel_name)
+
+
+_channel_indexes: Dict[int, ChannelIndex] = {}
+
+
+def get_channel_index(guild: discord.Guild) -> ChannelIndex:
+    """
+    Get the channel index of a guild, building it if necessary.
+
+    Parameters:
+    guild (discord.Guild): The guild.
+
+    Returns:
+    ChannelIndex: The channel index of the guild.
+    """
+    channel_index = _channel_indexes.get(guild.id)
+    if channel_index is None:
+        channel_index = _channel_indexes[guild.id] = ChannelIndex(guild)
+    return channel_index
+
+
+def invalidate_channel_index(guild_id: int) -> None:
+    """
+    Drop the channel index of a guild, it is rebuilt on the next lookup.
+
+    Parameters:
+    guild_id (int): The ID of the guild.
+    """
+    _channel_indexes.pop(guild_id, None)
@@ -0,0 +1,228 @@
+"""
+helpers/contributor_index.py contains the ContributorIndex, which holds the contributors of a single server, and the
+ContributorRegistry, which holds the contributor index of every guild.
+
+The index keeps the contributor records and the emoji dictionary in both directions, so finding the
+contributor an emoji mentions, or the emojis of a contributor, is a dictionary lookup. It also owns
+the EmojiMatcher for the server, and keeps all of these consistent when contributors are added or removed.
+
+The registry is keyed by guild ID, so renaming a guild has no effect on its contributors. The index of a guild is
+loaded from the store when the bot joins it, when it becomes available, or on its first use, and the indexes of
+guilds that have been idle for CONTRIBUTOR_CACHE_IDLE_TTL seconds, or that are least recently used beyond
+CONTRIBUTOR_CACHE_SIZE guilds, are evicted, so one process can serve any number of guilds.
+
+Earlier versions stored contributors by server name. Server names configured in LEGACY_CONTRIBUTOR_GUILDS are
+adopted by the configured guild when the registry is created. Any other legacy server name is adopted once the bot
+is ready, by the only guild with that name, and left alone if several guilds share it.
+"""
+
+import time
+import discord
+import config.config as cfg
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from helpers.emoji_matcher import EmojiMatcher
+from logger.logger import logger
+from storage.storage import Store
+
+
+class ContributorIndex:
+    def __init__(
+        self,
+        contributors: Optional[List[Dict[str, str]]] = None,
+        emoji_dict: Optional[Dict[str, str]] = None,
+    ):
+        # uid -> contributor record
+        self.contributors: Dict[str, Dict[str, str]] = {}
+        # emoji -> uid
+        self.emoji_to_uid: Dict[str, str] = {}
+        # uid -> emojis, a dict is used as an ordered set
+        self.uid_to_emojis: Dict[str, Dict[str, None]] = {}
+        self.matcher = EmojiMatcher()
+
+        for contributor in contributors or []:
+            self.contributors[contributor["uid"]] = contributor
+        for emoji, uid in (emoji_dict or {}).items():
+            self._map_emoji(emoji, str(uid))
+
+    def __len__(self) -> int:
+        return len(self.contributors)
+
+    @property
+    def emojis(self) -> List[str]:
+        """
+        The emojis of every contributor, in the order they were added.
+        """
+        return list(self.emoji_to_uid)
+
+    def get_contributor(self, uid: str) -> Optional[Dict[str, str]]:
+        return self.contributors.get(uid)
+
+    def get_uid(self, emoji: str) -> Optional[str]:
+        return self.emoji_to_uid.get(emoji)
+
+    def get_emojis(self, uid: str) -> List[str]:
+        return list(self.uid_to_emojis.get(uid, ()))
+
+    def find_mentions(self, content: str) -> List[Tuple[str, str]]:
+        """
+        Find the contributors mentioned by emoji in a message.
+
+        Parameters:
+        content (str): The content of the message.
+
+        Returns:
+        List[Tuple[str, str]]: The emoji and contributor uid of each contributor mentioned.
+        """
+        return self.matcher.find(content)
+
+    def add(self, uid: str, note: str, emoji: Optional[str] = None) -> Dict[str, str]:
+        """
+        Add a contributor, and optionally the emoji that mentions them.
+
+        Parameters:
+        uid (str): The user ID of the contributor.
+        note (str): A note to identify the contributor, usually their username.
+        emoji (Optional[str]): The emoji associated with the contributor.
+
+        Returns:
+        Dict[str, str]: The contributor record.
+        """
+        contributor = {"uid": uid, "note": note}
+        self.contributors[uid] = contributor
+        if emoji is not None:
+            self._map_emoji(emoji, uid)
+        return contributor
+
+    def remove(self, uid: str) -> Optional[Dict[str, str]]:
+        """
+        Remove a contributor and every emoji that mentions them.
+
+        Parameters:
+        uid (str): The user ID of the contributor.
+
+        Returns:
+        Optional[Dict[str, str]]: The removed contributor record, or None if the uid is not a contributor.
+        """
+        contributor = self.contributors.pop(uid, None)
+        for emoji in self.uid_to_emojis.pop(uid, {}):
+            del self.emoji_to_uid[emoji]
+            self.matcher.remove(emoji)
+        return contributor
+
+    def _map_emoji(self, emoji: str, uid: str) -> None:
+        previous_uid = self.emoji_to_uid.get(emoji)
+        if previous_uid is not None and previous_uid != uid:
+            self.uid_to_emojis[previous_uid].pop(emoji, None)
+
+        self.emoji_to_uid[emoji] = uid
+        self.uid_to_emojis.setdefault(uid, {})[emoji] = None
+        self.matcher.add(emoji, uid)
+
+
+class ContributorRegistry:
+    def __init__(
+        self,
+        store: Store,
+        max_guilds: int = cfg.CONTRIBUTOR_CACHE_SIZE,
+        idle_ttl: float = cfg.CONTRIBUTOR_CACHE_IDLE_TTL,
+    ):
+        self.store = store
+        self.max_guilds = max_guilds
+        self.idle_ttl = idle_ttl
+        # guild ID -> (last used, contributor index), least recently used first
+        self._indexes: "OrderedDict[int, Tuple[float, ContributorIndex]]" = (
+            OrderedDict()
+        )
+
+        for guild_id, server in cfg.LEGACY_CONTRIBUTOR_GUILDS.items():
+            self._adopt(guild_id, server)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._indexes
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, guild: discord.Guild) -> ContributorIndex:
+        """
+        Get the contributor index of a guild, loading it from the store if it is not loaded.
+        A guild without contributors gets an empty index.
+
+        Parameters:
+        guild (discord.Guild): The guild.
+
+        Returns:
+        ContributorIndex: The contributor index of the guild.
+        """
+        now = time.monotonic()
+        entry = self._indexes.get(guild.id)
+        if entry is None:
+            index = self._load(guild)
+        else:
+            index = entry[1]
+            self._indexes.move_to_end(guild.id)
+        self._indexes[guild.id] = (now, index)
+        self._evict(now)
+        return index
+
+    def load(self, guild: discord.Guild) -> None:
+        """
+        Load the contributor index of a guild ahead of its first use, for when the bot joins it or it becomes available.
+
+        Parameters:
+        guild (discord.Guild): The guild.
+        """
+        self.get(guild)
+
+    def evict(self, guild_id: int) -> None:
+        """
+        Drop the contributor index of a guild, for when the bot leaves it. Its contributors stay in the store.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        """
+        self._indexes.pop(guild_id, None)
+
+    def adopt_legacy(self, guilds: List[discord.Guild]) -> None:
+        """
+        Adopt the contributors stored by server name by earlier versions, for the server names that are not configured
+        in LEGACY_CONTRIBUTOR_GUILDS. Each server name is adopted by the only guild with that name, a name shared by
+        several guilds is not adopted, as there is no telling which guild it belonged to.
+
+        Parameters:
+        guilds (List[discord.Guild]): Every guild of the bot, so a server name shared by several guilds is detected.
+        """
+        for server in self.store.load_legacy_contributor_servers():
+            matches = [guild for guild in guilds if guild.name == server]
+            if len(matches) == 1:
+                self._adopt(matches[0].id, server)
+            elif len(matches) > 1:
+                logger.warning(
+                    f"Not adopting the contributors of {server}, as {len(matches)} guilds have that name: "
+                    f"{', '.join(str(guild.id) for guild in matches)}. Map it to a guild in [LEGACY_CONTRIBUTORS] in config.ini"
+                )
+
+    def _adopt(self, guild_id: int, server: str) -> None:
+        contributors, emojis = self.store.adopt_contributors(guild_id, server)
+        if contributors or emojis:
+            logger.info(
+                f"Adopted {contributors} contributors and {emojis} emojis stored under the server name {server} "
+                f"for guild {guild_id}"
+            )
+        # Reload the index with the adopted contributors and emojis on its next use
+        self.evict(guild_id)
+
+    def _load(self, guild: discord.Guild) -> ContributorIndex:
+        return ContributorIndex(*self.store.load_guild_contributors(guild.id))
+
+    def _evict(self, now: float) -> None:
+        # Entries are ordered by last use, so the idle ones are at the front
+        while self._indexes:
+            guild_id, (last_used, _) = next(iter(self._indexes.items()))
+            if (
+                len(self._indexes) <= self.max_guilds
+                and now - last_used < self.idle_ttl
+            ):
+                break
+            del self._indexes[guild_id]
@@ -0,0 +1,193 @@
+"""
+helpers/dm_queue.py contains the DMQueue, which delivers the DMs that notify contributors they have been mentioned.
+
+Listeners enqueue a DM and return straight away, a fixed number of workers then resolve the user and send it.
+Each recipient is always handled by the same worker, so the DMs of a recipient are sent in the order they were
+enqueued. A DM that is rate limited is put back on the queue once its exponential backoff has passed, so the
+worker carries on with the DMs of other recipients in the meantime, while the later DMs of the same recipient are
+held back behind it. A DM that cannot be delivered, for example because the recipient closed their DMs, is
+written to the dead letter log.
+"""
+
+import asyncio
+import json
+import time
+import discord
+import config.config as cfg
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set
+from discord.ext import commands
+from logger.logger import logger
+
+
+@dataclass
+class DMJob:
+    user_id: int
+    guild: Optional[discord.Guild]
+    message_link: str
+    attempts: int = 0
+
+
+class DMQueue:
+    def __init__(
+        self,
+        bot: commands.Bot,
+        workers: int = cfg.DM_WORKERS,
+        max_size: int = cfg.DM_QUEUE_SIZE,
+        max_retries: int = cfg.DM_MAX_RETRIES,
+        dead_letter_path: str = cfg.DM_DEAD_LETTER_FILE_PATH,
+    ):
+        """
+        Raises:
+        ValueError: If there is not at least one worker.
+        """
+        if workers < 1:
+            raise ValueError(f"The DM queue needs at least 1 worker, got {workers}")
+
+        self.bot = bot
+        self.max_retries = max_retries
+        self.dead_letter_path = dead_letter_path
+        self.queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=max(1, max_size // workers)) for _ in range(workers)
+        ]
+        self._workers: List[asyncio.Task] = []
+        # user ID -> the DMs of a recipient whose first DM is backing off, in order
+        self._backlogs: Dict[int, Deque[DMJob]] = {}
+        # the backoffs of DMs waiting to be put back on their queue
+        self._retries: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """
+        Start the workers that drain the queue.
+        """
+        self._workers = [
+            asyncio.create_task(self._worker(queue)) for queue in self.queues
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers. DMs that are still queued or backing off are dropped.
+        """
+        tasks = self._workers + list(self._retries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._retries.clear()
+        self._backlogs.clear()
+
+    def enqueue(
+        self, user_id: int, guild: Optional[discord.Guild], message_link: str
+    ) -> None:
+        """
+        Queue a DM notifying a contributor they have been mentioned in a message.
+        This never blocks, if the queue is full the DM is written to the dead letter log instead.
+
+        Parameters:
+        user_id (int): The ID of the contributor to send a DM to.
+        guild (Optional[discord.Guild]): The guild the contributor was mentioned in.
+        message_link (str): The link to the message that mentioned the contributor.
+        """
+        job = DMJob(user_id, guild, message_link)
+        try:
+            self.queues[user_id % len(self.queues)].put_nowait(job)
+        except asyncio.QueueFull:
+            self._dead_letter(job, "queue full")
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                backlog = self._backlogs.get(job.user_id)
+                if backlog is not None and backlog[0] is not job:
+                    # An earlier DM to the recipient is backing off, keep this one behind it
+                    backlog.append(job)
+                else:
+                    await self._deliver_in_order(queue, job)
+            except Exception as e:
+                logger.error(f"Unexpected error sending DM to {job.user_id}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _deliver_in_order(self, queue: asyncio.Queue, job: DMJob) -> None:
+        # Deliver the DM, then the DMs of the recipient that were held back behind it
+        while True:
+            backoff = await self._deliver(job)
+            backlog = self._backlogs.get(job.user_id)
+            if backoff is not None:
+                if backlog is None:
+                    self._backlogs[job.user_id] = deque([job])
+                task = asyncio.create_task(self._retry_after(queue, job, backoff))
+                self._retries.add(task)
+                task.add_done_callback(self._retries.discard)
+                return
+
+            if backlog is None:
+                return
+            backlog.popleft()
+            if not backlog:
+                del self._backlogs[job.user_id]
+                return
+            job = backlog[0]
+
+    async def _retry_after(
+        self, queue: asyncio.Queue, job: DMJob, backoff: float
+    ) -> None:
+        await asyncio.sleep(backoff)
+        await queue.put(job)
+
+    async def _deliver(self, job: DMJob) -> Optional[float]:
+        """
+        Make one attempt at delivering a DM.
+
+        Parameters:
+        job (DMJob): The DM.
+
+        Returns:
+        Optional[float]: The number of seconds to back off before retrying, or None if the DM is done with.
+        """
+        job.attempts += 1
+        try:
+            user = await self.bot.user_resolver.resolve(job.user_id, job.guild)
+            logger.info(f"Sending DM to {job.user_id}")
+            await user.send(
+                f"Hello {user.display_name}! You have been mentioned in this message! {job.message_link}"
+            )
+        except discord.NotFound:
+            self._dead_letter(job, "user not found")
+        except discord.Forbidden:
+            # The recipient has closed their DMs, or shares no server with the bot
+            self._dead_letter(job, "DMs closed")
+        except discord.HTTPException as e:
+            if e.status != 429 and e.status < 500:
+                self._dead_letter(job, f"HTTP {e.status}: {e.text}")
+                return None
+            if job.attempts > self.max_retries:
+                self._dead_letter(job, f"gave up after {job.attempts} attempts")
+                return None
+
+            # Respect the retry_after of a rate limit if we were given one
+            retry_after = getattr(e.response, "headers", {}).get("Retry-After")
+            backoff = max(float(retry_after or 0), 2 ** (job.attempts - 1))
+            logger.warning(
+                f"DM to {job.user_id} failed with HTTP {e.status}, retrying in {backoff}s"
+            )
+            return backoff
+        return None
+
+    def _dead_letter(self, job: DMJob, reason: str) -> None:
+        logger.warning(f"Unable to send DM to {job.user_id}: {reason}")
+        record = {
+            "time": time.time(),
+            "user_id": job.user_id,
+            "guild_id": job.guild.id if job.guild else None,
+            "message_link": job.message_link,
+            "attempts": job.attempts,
+            "reason": reason,
+        }
+        try:
+            with open(self.dead_letter_path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error(f"Error writing to the DM dead letter log: {e}")
@@ -0,0 +1,94 @@
+"""
+helpers/emoji_matcher.py contains the EmojiMatcher, which finds the contributor emojis used in a message.
+
+Custom emojis are written as <:name:id> or <a:name:id> in message content, so they are matched by
+parsing those tokens and looking the ID up in a dictionary. Any other emoji, such as a unicode emoji,
+is matched by an alternation of the remaining emojis compiled into the same pattern. Either way a
+message is scanned once, no matter how many contributors a server has.
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+CUSTOM_EMOJI_PATTERN = r"<a?:\w+:(?P<custom_id>\d+)>"
+_CUSTOM_EMOJI_REGEX = re.compile(CUSTOM_EMOJI_PATTERN)
+
+
+class EmojiMatcher:
+    def __init__(self, emoji_dict: Optional[Dict[str, str]] = None):
+        # custom emoji ID -> (emoji, contributor uid)
+        self.custom_emojis: Dict[str, Tuple[str, str]] = {}
+        # emoji -> contributor uid, for emojis that are not custom emojis
+        self.other_emojis: Dict[str, str] = {}
+        self._pattern: Optional[Pattern] = _CUSTOM_EMOJI_REGEX
+
+        for emoji, uid in (emoji_dict or {}).items():
+            self.add(emoji, uid)
+
+    def add(self, emoji: str, uid: str) -> None:
+        """
+        Add or replace the contributor mentioned by an emoji.
+
+        Parameters:
+        emoji (str): The emoji as stored in the emoji dictionary.
+        uid (str): The user ID of the contributor.
+        """
+        custom_match = _CUSTOM_EMOJI_REGEX.fullmatch(emoji)
+        if custom_match:
+            self.custom_emojis[custom_match.group("custom_id")] = (emoji, uid)
+        else:
+            self.other_emojis[emoji] = uid
+            self._pattern = None
+
+    def remove(self, emoji: str) -> None:
+        """
+        Remove an emoji from the matcher. Removing an unknown emoji is a no-op.
+
+        Parameters:
+        emoji (str): The emoji as stored in the emoji dictionary.
+        """
+        custom_match = _CUSTOM_EMOJI_REGEX.fullmatch(emoji)
+        if custom_match:
+            self.custom_emojis.pop(custom_match.group("custom_id"), None)
+        elif self.other_emojis.pop(emoji, None) is not None:
+            self._pattern = None
+
+    @property
+    def pattern(self) -> Pattern:
+        """
+        The compiled pattern, rebuilt only after the set of non-custom emojis changed.
+        """
+        if self._pattern is None:
+            # Longest first, so an emoji is never shadowed by one of its prefixes
+            others = sorted(self.other_emojis, key=len, reverse=True)
+            alternation = "|".join(re.escape(emoji) for emoji in others)
+            self._pattern = re.compile(
+                f"{CUSTOM_EMOJI_PATTERN}|(?P<other>{alternation})"
+                if others
+                else CUSTOM_EMOJI_PATTERN
+            )
+        return self._pattern
+
+    def find(self, content: str) -> List[Tuple[str, str]]:
+        """
+        Find the contributor emojis used in a message.
+
+        Parameters:
+        content (str): The content of the message.
+
+        Returns:
+        List[Tuple[str, str]]: The emoji and contributor uid of each contributor mentioned, in order of first use.
+        """
+        mentions: Dict[str, str] = {}
+
+        for match in self.pattern.finditer(content):
+            custom_id = match.group("custom_id")
+            if custom_id is not None:
+                if custom_id in self.custom_emojis:
+                    emoji, uid = self.custom_emojis[custom_id]
+                    mentions.setdefault(emoji, uid)
+            else:
+                emoji = match.group("other")
+                mentions.setdefault(emoji, self.other_emojis[emoji])
+
+        return list(mentions.items())
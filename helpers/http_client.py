@@ -0,0 +1,87 @@
+"""
+helpers/http_client.py is responsible for the bot's own REST calls to the Discord API.
+These are routes that discord.py does not expose in a way the bot can use, such as the users
+interested in a scheduled event.
+
+The client keeps a single pooled aiohttp session with keep-alive, so lookups share connections
+and never block the event loop the gateway runs on.
+"""
+
+import aiohttp
+import config.config as cfg
+from typing import Any, Dict, Optional
+from logger.logger import logger
+
+DISCORD_API_BASE_URL = "https://discord.com/api/v10"
+
+
+class DiscordRESTClient:
+    def __init__(
+        self,
+        token: str,
+        timeout: float = cfg.HTTP_TIMEOUT,
+        connect_timeout: float = cfg.HTTP_CONNECT_TIMEOUT,
+        pool_size: int = cfg.HTTP_POOL_SIZE,
+        keepalive_timeout: float = cfg.HTTP_KEEPALIVE_TIMEOUT,
+    ):
+        self.token = token
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, creating it on first use so it binds to the running event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"Authorization": f"Bot {self.token}"},
+            )
+        return self._session
+
+    async def get_json(
+        self, route: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """
+        Perform a GET request against the Discord API and decode the JSON body.
+
+        Parameters:
+        route (str): The API route, relative to DISCORD_API_BASE_URL.
+        params (Optional[Dict[str, Any]]): Query parameters. None values are dropped.
+
+        Returns:
+        Optional[Any]: The decoded response, or None if the request failed.
+        """
+        query = {
+            key: str(value).lower() if isinstance(value, bool) else str(value)
+            for key, value in (params or {}).items()
+            if value is not None
+        }
+
+        try:
+            async with self.session.get(
+                f"{DISCORD_API_BASE_URL}{route}", params=query
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.error(
+                    f"Error: {response.status} - {await response.text()} for {route}"
+                )
+        except (aiohttp.ClientError, TimeoutError) as e:
+            logger.error(f"Request to {route} failed: {e!r}")
+
+        return None
+
+    async def close(self) -> None:
+        """
+        Close the shared session and release pooled connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,57 @@
+"""
+helpers/permissions.py is responsible for checking whether a member may use the privileged commands.
+
+The roles that grant access, those named CORE_ROLE_NAME, are resolved to role IDs once per guild and invalidated
+by the role listeners in cogs/events.py. The roles of the member come with every interaction payload, so they are
+never cached, and a check looks the member's roles up in the core role IDs rather than making a REST call.
+"""
+
+import discord
+from consts.constants import CORE_ROLE_NAME
+from typing import Dict, FrozenSet
+
+# guild ID -> IDs of the roles named CORE_ROLE_NAME
+_core_role_ids: Dict[int, FrozenSet[int]] = {}
+
+
+def get_core_role_ids(guild: discord.Guild) -> FrozenSet[int]:
+    """
+    Get the IDs of the roles that grant access to privileged commands in a guild.
+
+    Parameters:
+    guild (discord.Guild): The guild.
+
+    Returns:
+    FrozenSet[int]: The IDs of the roles named CORE_ROLE_NAME, compared case-insensitively.
+    """
+    role_ids = _core_role_ids.get(guild.id)
+    if role_ids is None:
+        role_ids = _core_role_ids[guild.id] = frozenset(
+            role.id for role in guild.roles if role.name.lower() == CORE_ROLE_NAME
+        )
+    return role_ids
+
+
+def has_core_role(member: discord.Member) -> bool:
+    """
+    Check whether a member has one of the roles that grant access to privileged commands, by looking each of the
+    member's roles up in the core role IDs of the guild.
+
+    Parameters:
+    member (discord.Member): The member.
+
+    Returns:
+    bool: True if the member has a core role, False otherwise.
+    """
+    core_role_ids = get_core_role_ids(member.guild)
+    return any(role.id in core_role_ids for role in member.roles)
+
+
+def invalidate_guild_roles(guild_id: int) -> None:
+    """
+    Drop the cached core role IDs of a guild, for when a role is created, updated or deleted.
+
+    Parameters:
+    guild_id (int): The ID of the guild.
+    """
+    _core_role_ids.pop(guild_id, None)
@@ -0,0 +1,71 @@
+"""
+helpers/prefix_index.py contains the PrefixIndex, which finds the entries whose name starts with a prefix.
+
+Entries are kept in a sorted array of (folded name, key) pairs, so the entries matching a prefix are a contiguous
+slice found with a binary search. Matching ignores case, and adding or removing an entry is a single insertion or
+deletion, so the index can be kept current as names change. It is used to answer autocomplete interactions,
+which have to be answered within 3 seconds.
+"""
+
+import bisect
+from typing import Any, List, Tuple
+
+# The maximum number of choices Discord accepts in an autocomplete response
+AUTOCOMPLETE_LIMIT = 25
+
+
+def _fold(name: str) -> str:
+    return name.strip().casefold()
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._entries: List[Tuple[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, name: str, key: Any) -> None:
+        """
+        Add an entry.
+
+        Parameters:
+        name (str): The name to match prefixes against.
+        key (Any): Identifies the entry, keys must be comparable with each other.
+        """
+        bisect.insort(self._entries, (_fold(name), key))
+
+    def remove(self, name: str, key: Any) -> None:
+        """
+        Remove an entry. Removing an unknown entry is a no-op.
+
+        Parameters:
+        name (str): The name the entry was added with.
+        key (Any): The key the entry was added with.
+        """
+        entry = (_fold(name), key)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def search(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[Any]:
+        """
+        Find the entries whose name starts with a prefix, in order of name.
+
+        Parameters:
+        prefix (str): The prefix, matched ignoring case.
+        limit (int): The maximum number of entries to return.
+
+        Returns:
+        List[Any]: The keys of the matching entries.
+        """
+        prefix = _fold(prefix)
+        keys = []
+        position = bisect.bisect_left(self._entries, (prefix,))
+        while position < len(self._entries) and len(keys) < limit:
+            name, key = self._entries[position]
+            if not name.startswith(prefix):
+                break
+            keys.append(key)
+            position += 1
+        return keys
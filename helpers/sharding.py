@@ -0,0 +1,109 @@
+"""
+helpers/sharding.py contains the ShardPartition, which decides which guilds a bot process is responsible for.
+
+Discord assigns every guild to the shard (guild_id >> 22) % shard_count. When the shards are split across several
+processes with --shard-ids, each process only receives the gateway events of the guilds on its own shards, and the
+ShardPartition is used to give it only the background work of those guilds: the proposals it concludes, and the
+event announcements and conclusion side effects it resumes after a restart. Proposals published before their guild
+ID was recorded belong to the process that runs shard 0.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def shard_for(guild_id: int, shard_count: int) -> int:
+    """
+    Get the shard a guild is assigned to.
+
+    Parameters:
+    guild_id (int): The ID of the guild.
+    shard_count (int): The total number of shards.
+
+    Returns:
+    int: The shard ID.
+    """
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(value: Optional[str]) -> Optional[List[int]]:
+    """
+    Parse a list of shard IDs such as "0,1,4-7".
+
+    Parameters:
+    value (Optional[str]): Comma separated shard IDs and inclusive ranges of shard IDs.
+
+    Returns:
+    Optional[List[int]]: The shard IDs, or None if the value is empty.
+
+    Raises:
+    ValueError: If the value is not a valid list of shard IDs.
+    """
+    if not value or not value.strip():
+        return None
+
+    shard_ids: List[int] = []
+    for part in value.split(","):
+        first, _, last = part.strip().partition("-")
+        shard_ids.extend(range(int(first), int(last or first) + 1))
+    return sorted(set(shard_ids))
+
+
+class ShardPartition:
+    def __init__(
+        self,
+        shard_ids: Optional[Iterable[int]] = None,
+        shard_count: Optional[int] = None,
+    ):
+        """
+        Parameters:
+        shard_ids (Optional[Iterable[int]]): The shards this process runs, None for all of them.
+        shard_count (Optional[int]): The total number of shards, required with shard_ids.
+
+        Raises:
+        ValueError: If shard_ids is given without shard_count, or contains an ID outside of the shard count.
+        """
+        self.shard_count = shard_count
+        self.shard_ids = None if shard_ids is None else set(shard_ids)
+
+        if self.shard_ids is not None:
+            if shard_count is None:
+                raise ValueError(
+                    "A shard count is required when running a subset of the shards"
+                )
+            invalid = [i for i in self.shard_ids if not 0 <= i < shard_count]
+            if invalid:
+                raise ValueError(
+                    f"Invalid shard IDs for a shard count of {shard_count}: {invalid}"
+                )
+
+    @property
+    def owns_all(self) -> bool:
+        return self.shard_ids is None
+
+    def owns_guild(self, guild_id: Optional[int]) -> bool:
+        """
+        Check if a guild belongs to one of the shards of this process.
+
+        Parameters:
+        guild_id (Optional[int]): The ID of the guild, None if it is not known.
+
+        Returns:
+        bool: True if this process is responsible for the guild.
+        """
+        if self.shard_ids is None:
+            return True
+        if guild_id is None:
+            return 0 in self.shard_ids
+        return shard_for(int(guild_id), self.shard_count) in self.shard_ids
+
+    def owns_proposal(self, proposal_data: Dict[str, Any]) -> bool:
+        """
+        Check if a proposal was published in a guild that belongs to one of the shards of this process.
+
+        Parameters:
+        proposal_data (Dict[str, Any]): The data of the proposal.
+
+        Returns:
+        bool: True if this process is responsible for the proposal.
+        """
+        return self.owns_guild(proposal_data.get("guild_id"))
@@ -0,0 +1,99 @@
+"""
+helpers/user_resolver.py contains the UserResolver, which resolves a user ID to a discord.User while
+avoiding REST calls wherever possible.
+
+A user is looked up in the following order:
+- the gateway cache (bot.get_user, then guild.get_member)
+- a bounded LRU cache whose entries expire after a TTL
+- bot.fetch_user, where concurrent lookups of the same user share a single request
+
+Hit and miss counters are kept so the number of REST calls can be monitored.
+"""
+
+import asyncio
+import time
+import discord
+import config.config as cfg
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+from discord.ext import commands
+from logger.logger import logger
+
+
+class UserResolver:
+    def __init__(
+        self,
+        bot: commands.Bot,
+        max_size: int = cfg.USER_CACHE_SIZE,
+        ttl: float = cfg.USER_CACHE_TTL,
+    ):
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: "OrderedDict[int, Tuple[float, discord.User]]" = OrderedDict()
+        self._pending: Dict[int, asyncio.Task] = {}
+
+        self.gateway_hits = 0
+        self.cache_hits = 0
+        self.rest_fetches = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "gateway_hits": self.gateway_hits,
+            "cache_hits": self.cache_hits,
+            "rest_fetches": self.rest_fetches,
+        }
+
+    async def resolve(
+        self, user_id: int, guild: Optional[discord.Guild] = None
+    ) -> Union[discord.User, discord.Member]:
+        """
+        Resolve a user ID to a user.
+
+        Parameters:
+        user_id (int): The ID of the user.
+        guild (Optional[discord.Guild]): A guild the user is likely a member of.
+
+        Returns:
+        Union[discord.User, discord.Member]: The resolved user.
+
+        Raises:
+        discord.errors.NotFound: If the user does not exist.
+        """
+        user = self.bot.get_user(user_id) or (guild and guild.get_member(user_id))
+        if user is not None:
+            self.gateway_hits += 1
+            return user
+
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            cached_at, user = cached
+            if time.monotonic() - cached_at < self.ttl:
+                self._cache.move_to_end(user_id)
+                self.cache_hits += 1
+                return user
+            del self._cache[user_id]
+
+        # Share a single request between everyone waiting for the same user
+        task = self._pending.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(user_id))
+            self._pending[user_id] = task
+            task.add_done_callback(lambda _: self._pending.pop(user_id, None))
+
+        return await asyncio.shield(task)
+
+    async def _fetch(self, user_id: int) -> discord.User:
+        self.rest_fetches += 1
+        user = await self.bot.fetch_user(user_id)
+
+        self._cache[user_id] = (time.monotonic(), user)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+        logger.info(
+            f"Fetched user {user_id} from the API, user cache stats: {self.stats}"
+        )
+        return user
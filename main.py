@@ -3,16 +3,32 @@ This module contains the main class for the bot, which sets up the bot with inte
 and posted events, loads the cogs, sets up commands and events for the bot, and then starts the bot.
 """
 
+import argparse
 import discord
 import os
 import asyncio
+import time
+import config.config as cfg
 from discord.ext import commands
-from tasks.tasks import check_events, check_concluded_proposals_task
-from helpers.helpers import (
-    load_posted_events,
-    load_contributors_and_emoji_dicts,
-    load_ongoing_votes,
-)
+from logger.logger import logger
+from typing import List, Optional
+from tasks.tasks import check_events, checkpoint_store, conclude_proposal
+from tasks.scheduler import DeadlineScheduler
+from helpers.http_client import DiscordRESTClient
+from helpers.user_resolver import UserResolver
+from helpers.dm_queue import DMQueue
+from storage.storage import Store
+from proposals.vote_ledger import VoteLedger
+from proposals.id_allocator import ProposalIDAllocator
+from proposals.draft_repository import DraftRepository
+from proposals.conclusion_outbox import ConclusionOutbox
+from proposals.snapshot_worker import SnapshotWorker, SnapshotWorkerError
+from events.posted_events import PostedEventsRegistry
+from events.announcements import EventAnnouncer
+from events.interest_roster import InterestRoster
+from helpers.contributor_index import ContributorRegistry
+from helpers.sharding import ShardPartition, parse_shard_ids
+from helpers.cache_profile import cache_options
 from cogs.help import HelpCommandCog
 from cogs.contributors import ContributorCommandsCog
 from cogs.events import EventsCog
@@ -21,10 +37,31 @@ from cogs.gov import GovCommandsCog
 
 
 class Bot:
+    def __init__(
+        self,
+        sharded: bool = cfg.SHARDED,
+        shard_ids: Optional[List[int]] = parse_shard_ids(cfg.SHARD_IDS),
+        shard_count: Optional[int] = cfg.SHARD_COUNT,
+    ):
+        self.sharded = sharded or shard_ids is not None or shard_count is not None
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.shard_partition = ShardPartition(shard_ids, shard_count)
+
     async def setup_background_tasks(self):
         # Start the background tasks
         check_events.start(self.bot)
-        check_concluded_proposals_task.start(self.bot)
+        checkpoint_store.start(self.bot.store)
+        self.bot.proposal_scheduler.start()
+        self.bot.conclusion_outbox.start()
+        self.bot.event_announcer.start()
+        self.bot.dm_queue.start()
+
+        # Start the Snapshot worker up front, if that fails it is retried when a proposal passes
+        try:
+            await self.bot.snapshot_worker.start()
+        except SnapshotWorkerError as e:
+            logger.error(e)
 
     async def main(self):
         # Setup the bot with intents
@@ -32,30 +69,105 @@ class Bot:
         intents.message_content = True
         intents.reactions = True
         intents.members = True
-        self.bot = commands.Bot(command_prefix="", intents=intents)
+        # Size the member and message caches according to the cache profile
+        options = cache_options()
+        if self.sharded:
+            # Run the given shards in this process, or let Discord pick the shard count and run all of them
+            self.bot = commands.AutoShardedBot(
+                command_prefix="",
+                intents=intents,
+                shard_ids=self.shard_ids,
+                shard_count=self.shard_count,
+                **options,
+            )
+        else:
+            self.bot = commands.Bot(command_prefix="", intents=intents, **options)
+        self.bot.shard_partition = self.shard_partition
+        self.bot.rest_client = DiscordRESTClient(os.getenv("DISCORD_BOT_TOKEN"))
+        self.bot.user_resolver = UserResolver(self.bot)
+        self.bot.dm_queue = DMQueue(self.bot)
+        self.bot.snapshot_worker = SnapshotWorker()
+
+        # Open the store, migrating any JSON files from earlier versions
+        self.bot.store = Store()
+        self.bot.store.migrate_json_files()
+        self.bot.id_allocator = ProposalIDAllocator(self.bot.store)
+        self.bot.drafts = DraftRepository(self.bot.store)
+
+        # Load the contributors, emoji dicts, and posted events, and the ongoing votes on the shards of this process
+        self.bot.ongoing_votes = {
+            proposal_id: proposal_data
+            for proposal_id, proposal_data in self.bot.store.load_ongoing_votes().items()
+            if self.bot.shard_partition.owns_proposal(proposal_data)
+        }
+        self.bot.vote_ledger = VoteLedger(
+            self.bot.store,
+            [
+                int(proposal_data["message_id"])
+                for proposal_data in self.bot.ongoing_votes.values()
+            ],
+        )
+        self.bot.posted_events = PostedEventsRegistry(self.bot.store)
+        self.bot.event_announcer = EventAnnouncer(self.bot)
+        self.bot.interest_roster = InterestRoster(self.bot.store, self.bot.rest_client)
+        self.bot.contributors = ContributorRegistry(self.bot.store)
 
-        # Load the contributors, emoji dicts, and posted events
-        self.bot.ongoing_votes = load_ongoing_votes()
-        self.bot.posted_events = load_posted_events()
-        self.contributors, self.emoji_dicts = load_contributors_and_emoji_dicts()
+        # Resume the side effects of proposals that were concluded before a restart
+        self.bot.conclusion_outbox = ConclusionOutbox(self.bot)
+
+        # Schedule the conclusion of every ongoing vote that has not been concluded yet
+        self.bot.proposal_scheduler = DeadlineScheduler(
+            lambda proposal_id: conclude_proposal(self.bot, proposal_id),
+            "proposal conclusion",
+        )
+        for proposal_id, proposal_data in self.bot.ongoing_votes.items():
+            if proposal_id not in self.bot.conclusion_outbox:
+                self.bot.proposal_scheduler.schedule(
+                    proposal_id, proposal_data["end_time"]
+                )
 
         # Load the cogs
         await self.bot.add_cog(HelpCommandCog(self.bot))
-        await self.bot.add_cog(
-            ContributorCommandsCog(self.bot, self.contributors, self.emoji_dicts)
-        )
+        await self.bot.add_cog(ContributorCommandsCog(self.bot, self.bot.contributors))
         await self.bot.add_cog(GovCommandsCog(self.bot))
-        await self.bot.add_cog(
-            EventsCog(self.bot, self.contributors, self.emoji_dicts)
-        )
+        await self.bot.add_cog(EventsCog(self.bot, self.bot.contributors))
 
         # Setup and start background tasks
         await self.setup_background_tasks()
 
         # Run the bot
-        await self.bot.start(os.getenv("DISCORD_BOT_TOKEN"))
+        self.bot.started_at = time.monotonic()
+        try:
+            await self.bot.start(os.getenv("DISCORD_BOT_TOKEN"))
+        finally:
+            await self.bot.proposal_scheduler.stop()
+            await self.bot.conclusion_outbox.stop()
+            await self.bot.event_announcer.stop()
+            await self.bot.dm_queue.stop()
+            await self.bot.snapshot_worker.stop()
+            await self.bot.rest_client.close()
+            checkpoint_store.cancel()
+            self.bot.store.close()
 
 
 if __name__ == "__main__":
-    bot = Bot()
+    parser = argparse.ArgumentParser(description="Run the Bloom bot.")
+    parser.add_argument(
+        "--shard-ids",
+        type=parse_shard_ids,
+        default=parse_shard_ids(cfg.SHARD_IDS),
+        help='the shards to run in this process, such as "0-3" (requires --shard-count)',
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=cfg.SHARD_COUNT,
+        help="the total number of shards across every process",
+    )
+    args = parser.parse_args()
+
+    try:
+        bot = Bot(shard_ids=args.shard_ids, shard_count=args.shard_count)
+    except ValueError as e:
+        parser.error(str(e))
     asyncio.run(bot.main())
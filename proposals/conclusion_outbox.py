@@ -0,0 +1,179 @@
+"""
+conclusion_outbox contains the ConclusionOutbox, which carries out the side effects of concluding a proposal.
+
+Once the result of a vote is known it is persisted as a conclusion job, and the side effects are run from the
+outbox as a sequence of steps:
+- snapshot: create the Snapshot proposal, for proposals that passed only.
+- announce: post the result message to the thread of the proposal.
+- finalize: remove the proposal from the ongoing votes, together with the job itself.
+
+Each step that succeeds is recorded under its idempotency key, "<proposal ID>:<step>", so a job that is retried,
+or resumed after a restart, never repeats a step that already succeeded. A failing job is retried with exponential
+backoff, and every job runs in its own task, so a slow or failing proposal never holds up the others.
+"""
+
+import time
+import discord
+import config.config as cfg
+from discord.ext import commands
+from typing import Any, Dict
+from logger.logger import logger
+from tasks.scheduler import DeadlineScheduler
+
+STEPS = ("snapshot", "announce", "finalize")
+
+SNAPSHOT_CHOICES = ["Adopt", "Reasses", "Abstain"]
+
+
+class ConclusionOutbox:
+    def __init__(
+        self,
+        bot: commands.Bot,
+        base_delay: float = cfg.OUTBOX_BASE_DELAY,
+        max_delay: float = cfg.OUTBOX_MAX_DELAY,
+    ):
+        self.bot = bot
+        self.store = bot.store
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.scheduler = DeadlineScheduler(self._run_job, "conclusion outbox")
+
+        # Resume the jobs left over from before a restart, of the proposals on the shards of this process
+        self.jobs: Dict[str, Dict[str, Any]] = {
+            proposal_id: job
+            for proposal_id, job in self.store.load_conclusion_jobs().items()
+            if bot.shard_partition.owns_proposal(job["data"]["proposal"])
+        }
+        for proposal_id, job in self.jobs.items():
+            self.scheduler.schedule(proposal_id, job["next_attempt"])
+
+    def __contains__(self, proposal_id: str) -> bool:
+        return proposal_id in self.jobs
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def start(self) -> None:
+        self.scheduler.start()
+
+    async def stop(self) -> None:
+        await self.scheduler.stop()
+
+    def enqueue(
+        self,
+        proposal_id: str,
+        proposal_data: Dict[str, Any],
+        passed: bool,
+        result_message: str,
+    ) -> None:
+        """
+        Persist the conclusion of a proposal and run its side effects as soon as possible.
+
+        Parameters:
+        proposal_id (str): The ID of the proposal.
+        proposal_data (Dict[str, Any]): The data of the proposal, including the final vote counts.
+        passed (bool): Whether the vote passed, in which case a Snapshot proposal is created.
+        result_message (str): The message announcing the result in the thread of the proposal.
+        """
+        job = {
+            "data": {
+                "proposal": proposal_data,
+                "passed": passed,
+                "result_message": result_message,
+            },
+            "attempts": 0,
+            "next_attempt": time.time(),
+            "completed": set(),
+        }
+        self.store.save_conclusion_job(
+            proposal_id, job["data"], job["attempts"], job["next_attempt"]
+        )
+        self.jobs[proposal_id] = job
+        self.scheduler.schedule(proposal_id, job["next_attempt"])
+
+    async def _run_job(self, proposal_id: str) -> None:
+        await self.bot.wait_until_ready()
+
+        job = self.jobs.get(proposal_id)
+        if job is None:
+            return
+
+        for step in STEPS:
+            idempotency_key = f"{proposal_id}:{step}"
+            if idempotency_key in job["completed"]:
+                continue
+
+            try:
+                await getattr(self, f"_{step}")(
+                    proposal_id, job["data"], idempotency_key
+                )
+            except Exception as e:
+                self._retry_later(proposal_id, job, step, e)
+                return
+
+            if step == "finalize":
+                self.jobs.pop(proposal_id, None)
+            else:
+                self.store.complete_conclusion_step(proposal_id, idempotency_key)
+                job["completed"].add(idempotency_key)
+
+        logger.info(f"Concluded proposal {proposal_id}")
+
+    def _retry_later(
+        self, proposal_id: str, job: Dict[str, Any], step: str, error: Exception
+    ) -> None:
+        job["attempts"] += 1
+        delay = min(self.base_delay * 2 ** (job["attempts"] - 1), self.max_delay)
+        job["next_attempt"] = time.time() + delay
+        self.store.save_conclusion_job(
+            proposal_id, job["data"], job["attempts"], job["next_attempt"]
+        )
+        self.scheduler.schedule(proposal_id, job["next_attempt"])
+        logger.error(
+            f"Step {step} of concluding proposal {proposal_id} failed (attempt {job['attempts']}), retrying in {delay:.0f}s. Error: {error}"
+        )
+
+    async def _snapshot(
+        self, proposal_id: str, data: Dict[str, Any], idempotency_key: str
+    ) -> None:
+        if not data["passed"]:
+            return
+
+        proposal_data = data["proposal"]
+        await self.bot.snapshot_worker.create_proposal(
+            proposal_data["title"],
+            proposal_data["draft"]["abstract"],
+            proposal_data["draft"]["background"],
+            proposal_data["draft"]["additional"],
+            SNAPSHOT_CHOICES,
+            idempotency_key=idempotency_key,
+        )
+
+    async def _announce(
+        self, proposal_id: str, data: Dict[str, Any], idempotency_key: str
+    ) -> None:
+        proposal_data = data["proposal"]
+        thread_id = int(proposal_data["thread_id"])
+
+        channel = self.bot.get_channel(int(proposal_data["channel_id"]))
+        thread = channel.get_thread(thread_id) if channel else None
+        try:
+            if thread is None:
+                # Archived threads are not cached
+                thread = await self.bot.fetch_channel(thread_id)
+            await thread.send(data["result_message"])
+        except (discord.Forbidden, discord.NotFound) as e:
+            # Retrying cannot fix a deleted thread or missing permissions
+            logger.error(
+                f"Unable to post the result of proposal {proposal_id} to thread {thread_id}: {e}"
+            )
+
+    async def _finalize(
+        self, proposal_id: str, data: Dict[str, Any], idempotency_key: str
+    ) -> None:
+        proposal_data = data["proposal"]
+        with self.store.transaction():
+            self.store.remove_ongoing_vote(proposal_id)
+            self.bot.vote_ledger.untrack(int(proposal_data["message_id"]))
+            self.store.remove_conclusion_job(proposal_id)
+        self.bot.ongoing_votes.pop(proposal_id, None)
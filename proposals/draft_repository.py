@@ -0,0 +1,201 @@
+"""
+draft_repository contains the DraftRepository, which keeps the draft proposals of every guild.
+
+Each draft gets a stable draft ID when it is created, which the select menus use as their value. Drafts are
+partitioned by guild and indexed by draft ID, by title and by author, so every lookup is a dictionary lookup
+regardless of how many drafts are open. Titles are also kept in a prefix index, which answers the draft title
+autocomplete. Every change is persisted to the store as a single row, so drafts survive restarts.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+from helpers.prefix_index import AUTOCOMPLETE_LIMIT, PrefixIndex
+from storage.storage import Store
+
+
+def _title_key(title: str) -> str:
+    return title.strip()
+
+
+class DraftRepository:
+    def __init__(self, store: Store):
+        self.store = store
+        # guild ID -> draft ID -> draft, in order of creation
+        self.drafts: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        # guild ID -> title -> draft ID
+        self._by_title: Dict[int, Dict[str, str]] = {}
+        # guild ID -> author ID -> draft IDs
+        self._by_author: Dict[int, Dict[int, Set[str]]] = {}
+        # guild ID -> prefix index of the titles
+        self._title_prefixes: Dict[int, PrefixIndex] = {}
+
+        for draft_id, guild_id, draft in store.load_drafts():
+            self._index(guild_id, {**draft, "draft_id": str(draft_id)})
+
+    def list(self, guild_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the drafts of a guild, in order of creation.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+
+        Returns:
+        List[Dict[str, Any]]: The drafts.
+        """
+        return list(self.drafts.get(guild_id, {}).values())
+
+    def count(self, guild_id: int) -> int:
+        return len(self.drafts.get(guild_id, {}))
+
+    def get(self, guild_id: int, draft_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a draft by its draft ID.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        draft_id (str): The ID of the draft.
+
+        Returns:
+        Optional[Dict[str, Any]]: The draft, or None if the guild has no such draft.
+        """
+        return self.drafts.get(guild_id, {}).get(draft_id)
+
+    def get_by_title(self, guild_id: int, title: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a draft by its title, ignoring surrounding whitespace.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        title (str): The title of the draft.
+
+        Returns:
+        Optional[Dict[str, Any]]: The draft, or None if the guild has no draft with that title.
+        """
+        draft_id = self._by_title.get(guild_id, {}).get(_title_key(title))
+        return self.get(guild_id, draft_id) if draft_id is not None else None
+
+    def search(
+        self, guild_id: int, prefix: str, limit: int = AUTOCOMPLETE_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the drafts of a guild whose title starts with a prefix, ignoring case.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        prefix (str): The prefix of the title.
+        limit (int): The maximum number of drafts to return.
+
+        Returns:
+        List[Dict[str, Any]]: The matching drafts, in order of title.
+        """
+        title_prefixes = self._title_prefixes.get(guild_id)
+        if title_prefixes is None:
+            return []
+        return [
+            self.drafts[guild_id][draft_id]
+            for draft_id in title_prefixes.search(prefix, limit)
+        ]
+
+    def by_author(self, guild_id: int, member_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the drafts of a guild written by a member.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        member_id (int): The ID of the author.
+
+        Returns:
+        List[Dict[str, Any]]: The drafts of the author.
+        """
+        draft_ids = self._by_author.get(guild_id, {}).get(member_id, set())
+        return [self.drafts[guild_id][draft_id] for draft_id in draft_ids]
+
+    def create(self, guild_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a draft.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        data (Dict[str, Any]): The member_id, title, type, abstract, background and additional of the draft.
+
+        Returns:
+        Dict[str, Any]: The draft, including its draft_id.
+        """
+        draft_id = self.store.insert_draft(guild_id, data)
+        draft = {**data, "draft_id": str(draft_id)}
+        self._index(guild_id, draft)
+        return draft
+
+    def update(
+        self, guild_id: int, draft_id: str, data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a draft.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        draft_id (str): The ID of the draft.
+        data (Dict[str, Any]): The fields to update.
+
+        Returns:
+        Optional[Dict[str, Any]]: The updated draft, or None if the guild has no such draft.
+        """
+        draft = self.get(guild_id, draft_id)
+        if draft is None:
+            return None
+
+        self._unindex_fields(guild_id, draft)
+        draft.update(data)
+        self._index_fields(guild_id, draft)
+        self.store.update_draft(int(draft_id), self._data(draft))
+        return draft
+
+    def remove(self, guild_id: int, draft_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove a draft, for when it is deleted or published.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        draft_id (str): The ID of the draft.
+
+        Returns:
+        Optional[Dict[str, Any]]: The removed draft, or None if the guild has no such draft.
+        """
+        draft = self.drafts.get(guild_id, {}).pop(draft_id, None)
+        if draft is not None:
+            self._unindex_fields(guild_id, draft)
+            self.store.remove_draft(int(draft_id))
+        return draft
+
+    def _data(self, draft: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in draft.items() if key != "draft_id"}
+
+    def _index(self, guild_id: int, draft: Dict[str, Any]) -> None:
+        self.drafts.setdefault(guild_id, {})[draft["draft_id"]] = draft
+        self._index_fields(guild_id, draft)
+
+    def _index_fields(self, guild_id: int, draft: Dict[str, Any]) -> None:
+        draft_id = draft["draft_id"]
+        # Keep the first draft with a given title, as a linear search would
+        self._by_title.setdefault(guild_id, {}).setdefault(
+            _title_key(draft["title"]), draft_id
+        )
+        self._by_author.setdefault(guild_id, {}).setdefault(
+            draft.get("member_id"), set()
+        ).add(draft_id)
+        self._title_prefixes.setdefault(guild_id, PrefixIndex()).add(
+            draft["title"], draft_id
+        )
+
+    def _unindex_fields(self, guild_id: int, draft: Dict[str, Any]) -> None:
+        draft_id = draft["draft_id"]
+        titles = self._by_title[guild_id]
+        if titles.get(_title_key(draft["title"])) == draft_id:
+            del titles[_title_key(draft["title"])]
+
+        authors = self._by_author[guild_id]
+        author_drafts = authors.get(draft.get("member_id"), set())
+        author_drafts.discard(draft_id)
+        if not author_drafts:
+            authors.pop(draft.get("member_id"), None)
+
+        self._title_prefixes[guild_id].remove(draft["title"], draft_id)
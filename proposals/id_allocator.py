@@ -0,0 +1,105 @@
+"""
+id_allocator contains the ProposalIDAllocator, which hands out the BGP and BBP numbers of published proposals.
+
+Each ID type is a sequence with an in-memory counter, so allocating an ID is O(1), guarded by an asyncio lock so
+concurrent publishes never get the same number. IDs are reserved in the store in blocks of PROPOSAL_ID_BLOCK_SIZE
+before they are handed out, and the reservation is committed with synchronous=FULL, so an ID is never handed out
+twice, even after a crash or by another process running other shards. A crash can skip the unused IDs of the
+current block, a block size of 1 avoids gaps. When several processes share the database, peek only accounts for
+the IDs this process allocated.
+The sequences are seeded once from ID_START_VALUES in config.ini, which is never written to.
+"""
+
+import asyncio
+import config.config as cfg
+from consts.types import BUDGET_ID_TYPE, GOVERNANCE_ID_TYPE
+from typing import Dict
+from storage.storage import Store
+
+# The last ID used by earlier versions, which kept the sequences in config.ini
+SEQUENCE_SEEDS: Dict[str, int] = {
+    GOVERNANCE_ID_TYPE: cfg.current_governance_id,
+    BUDGET_ID_TYPE: cfg.current_budget_id,
+}
+
+
+class ProposalIDAllocator:
+    def __init__(self, store: Store, block_size: int = cfg.PROPOSAL_ID_BLOCK_SIZE):
+        self.store = store
+        self.block_size = max(block_size, 1)
+        self._lock = asyncio.Lock()
+
+        # ID type -> the last ID reserved in the store
+        self._reserved: Dict[str, int] = store.load_sequences()
+        for id_type, seed in SEQUENCE_SEEDS.items():
+            if id_type not in self._reserved:
+                self._reserved[id_type] = self.store.seed_sequence(id_type, seed)
+
+        # ID type -> the next ID to hand out
+        self._next: Dict[str, int] = {
+            id_type: reserved + 1 for id_type, reserved in self._reserved.items()
+        }
+
+    def peek(self, id_type: str) -> int:
+        """
+        Get the ID the next allocation of an ID type will return, without allocating it.
+
+        Parameters:
+        id_type (str): GOVERNANCE_ID_TYPE or BUDGET_ID_TYPE.
+
+        Returns:
+        int: The next ID.
+        """
+        return self._next[self._validate(id_type)]
+
+    async def allocate(self, id_type: str) -> int:
+        """
+        Allocate the next ID of an ID type.
+
+        Parameters:
+        id_type (str): GOVERNANCE_ID_TYPE or BUDGET_ID_TYPE.
+
+        Returns:
+        int: The allocated ID.
+
+        Raises:
+        ValueError: If the ID type is invalid.
+        """
+        return (await self.reserve(id_type, 1))[0]
+
+    async def reserve(self, id_type: str, count: int) -> range:
+        """
+        Allocate several consecutive IDs of an ID type at once.
+
+        Parameters:
+        id_type (str): GOVERNANCE_ID_TYPE or BUDGET_ID_TYPE.
+        count (int): The number of IDs to allocate.
+
+        Returns:
+        range: The allocated IDs.
+
+        Raises:
+        ValueError: If the ID type is invalid, or count is not positive.
+        """
+        id_type = self._validate(id_type)
+        if count < 1:
+            raise ValueError(f"Invalid count: {count}")
+
+        async with self._lock:
+            start = self._next[id_type]
+            if start + count - 1 > self._reserved[id_type]:
+                # Reserve a new block durably before handing it out
+                size = max(count, self.block_size)
+                reserved = self.store.reserve_sequence(id_type, size)
+                if reserved - size != self._reserved[id_type]:
+                    # Another process reserved IDs in the meantime, start after them
+                    start = reserved - size + 1
+                self._reserved[id_type] = reserved
+            self._next[id_type] = start + count
+            return range(start, start + count)
+
+    def _validate(self, id_type: str) -> str:
+        id_type = id_type.lower()
+        if id_type not in self._next:
+            raise ValueError(f"Invalid id_type: {id_type}")
+        return id_type
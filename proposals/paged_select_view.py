@@ -0,0 +1,73 @@
+"""
+PagedSelectView is a discord.ui.View that shows a select menu one page at a time, with previous and next buttons.
+A select menu holds at most 25 options, so the draft selects of the publish_draft and vote_draft commands are
+paged through this view to cover any number of drafts.
+"""
+
+import discord
+from typing import Any, Callable, List
+
+# The maximum number of options of a select menu
+PAGE_SIZE = 25
+
+
+class PagedSelectView(discord.ui.View):
+    def __init__(
+        self,
+        items: List[Any],
+        make_select: Callable[[List[Any]], discord.ui.Select],
+        page_size: int = PAGE_SIZE,
+    ):
+        """
+        Parameters:
+        items (List[Any]): The items to choose from.
+        make_select (Callable[[List[Any]], discord.ui.Select]): Creates the select menu of the items of a page.
+        page_size (int): The number of items per page, at most 25.
+        """
+        super().__init__()
+        self.items = items
+        self.make_select = make_select
+        self.page_size = page_size
+        self.page = 0
+        self.pages = max((len(items) + page_size - 1) // page_size, 1)
+        self.select = None
+
+        if self.pages == 1:
+            self.remove_item(self.previous)
+            self.remove_item(self.page_label)
+            self.remove_item(self.next)
+        self._render()
+
+    def _render(self) -> None:
+        if self.select is not None:
+            self.remove_item(self.select)
+        start = self.page * self.page_size
+        self.select = self.make_select(self.items[start : start + self.page_size])
+        self.select.row = 0
+        self.add_item(self.select)
+
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page == self.pages - 1
+        self.page_label.label = f"Page {self.page + 1}/{self.pages}"
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.grey, row=1)
+    async def previous(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        self.page = max(self.page - 1, 0)
+        self._render()
+        await interaction.response.edit_message(view=self)
+
+    @discord.ui.button(
+        label="Page", style=discord.ButtonStyle.grey, row=1, disabled=True
+    )
+    async def page_label(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        pass
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.grey, row=1)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.page + 1, self.pages - 1)
+        self._render()
+        await interaction.response.edit_message(view=self)
@@ -3,14 +3,16 @@ ProposalButtonsView is a discord.ui.View that contains buttons for creating, edi
 """
 
 import discord
+from .paged_select_view import PagedSelectView
 from .proposal_modal import ProposalModal
 from .proposal_selects import DeleteProposalSelect, EditProposalSelect
 
 
 class ProposalButtonsView(discord.ui.View):
-    def __init__(self, proposals):
+    def __init__(self, drafts, guild_id):
         super().__init__()
-        self.proposals = proposals
+        self.drafts = drafts
+        self.guild_id = guild_id
 
     @discord.ui.button(label="Create", style=discord.ButtonStyle.green)
     async def create(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -21,19 +23,19 @@ class ProposalButtonsView(discord.ui.View):
 
     @discord.ui.button(label="Edit", style=discord.ButtonStyle.blurple)
     async def edit(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self.proposals:
+        if not self.drafts.count(self.guild_id):
             await interaction.response.send_message("No proposals to edit.")
         else:
-            self.clear_items()
-            self.add_item(EditProposalSelect(self.proposals))
-            await interaction.response.edit_message(view=self)
+            view = PagedSelectView(self.drafts.list(self.guild_id), EditProposalSelect)
+            await interaction.response.edit_message(view=view)
 
     @discord.ui.button(label="Delete", style=discord.ButtonStyle.red)
     async def delete(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if there are any proposals to delete
-        if not self.proposals:
+        if not self.drafts.count(self.guild_id):
             await interaction.response.send_message("No proposals to delete.")
         else:
-            self.clear_items()
-            self.add_item(DeleteProposalSelect(self.proposals))
-            await interaction.response.edit_message(view=self)
+            view = PagedSelectView(
+                self.drafts.list(self.guild_id), DeleteProposalSelect
+            )
+            await interaction.response.edit_message(view=view)
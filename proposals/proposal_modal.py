@@ -4,8 +4,6 @@ proposal_modal is a discord.ui.Modal that is used to create or edit a proposal.
 
 import discord
 from discord import ui
-from proposals.proposals import proposals
-from config import config as cfg
 from consts.types import GOVERNANCE_ID_TYPE, BUDGET_ID_TYPE
 
 class ProposalModal(ui.Modal, title="Create/Edit Proposal"):
@@ -50,11 +48,16 @@ class ProposalModal(ui.Modal, title="Create/Edit Proposal"):
             self.abstract.default = proposal["abstract"]
             self.additional.default = proposal["additional"]
 
-    def generate_full_title(self, proposal_type, draft_title):
+    def generate_full_title(self, id_allocator, proposal_type, draft_title):
+        # Preview the title with the next ID, the ID itself is only allocated when the draft is published
         if proposal_type == "governance":
-            prefix = f"Bloom General Proposal (BGP) #{cfg.current_governance_id}: "
+            prefix = (
+                f"Bloom General Proposal (BGP) #{id_allocator.peek(proposal_type)}: "
+            )
         elif proposal_type == "budget":
-            prefix = f"Bloom Budget Proposal (BBP) #{cfg.current_budget_id}: "
+            prefix = (
+                f"Bloom Budget Proposal (BBP) #{id_allocator.peek(proposal_type)}: "
+            )
         else:
             prefix = ""
 
@@ -71,7 +74,9 @@ class ProposalModal(ui.Modal, title="Create/Edit Proposal"):
             )
             return
 
-        full_title = self.generate_full_title(self.proposal_type.value, self.name.value)
+        full_title = self.generate_full_title(
+            interaction.client.id_allocator, self.proposal_type.value, self.name.value
+        )
         # Validate title length
         if len(full_title) > 100:
             await interaction.response.send_message(
@@ -80,8 +85,11 @@ class ProposalModal(ui.Modal, title="Create/Edit Proposal"):
             )
             return
 
-        # Check if a proposal with the same name already exists
-        if self.proposal is None and any(proposal["title"] == self.name.value for proposal in proposals):
+        # Check if another proposal with the same name already exists
+        existing = interaction.client.drafts.get_by_title(
+            interaction.guild_id, self.name.value
+        )
+        if existing is not None and existing is not self.proposal:
             await interaction.response.send_message(
                 'A proposal with this name already exists.',
                 ephemeral=True,
@@ -99,11 +107,13 @@ class ProposalModal(ui.Modal, title="Create/Edit Proposal"):
         }
 
         if self.proposal is None:
-            # If it's a new proposal, add it to the list
-            proposals.append(proposal_data)
+            # If it's a new proposal, add it to the drafts
+            interaction.client.drafts.create(interaction.guild_id, proposal_data)
         else:
             # Update existing proposal
-            self.proposal.update(proposal_data)
+            interaction.client.drafts.update(
+                interaction.guild_id, self.proposal["draft_id"], proposal_data
+            )
 
         # Clear the buttons and show the response when a proposal is created/edited
         e = discord.Embed()
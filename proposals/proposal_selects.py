@@ -1,5 +1,6 @@
 """
 proposal_selects is a discord.ui.select that contains the select menus for the publish_draft, delete_draft, and edit_draft commands. It is used in the vote_draft command in the GovCommandsCog class.
+The value of each option is the draft ID, so the selected draft is looked up directly in bot.drafts.
 """
 
 import discord
@@ -8,76 +9,61 @@ from .proposal_modal import ProposalModal
 
 
 class PublishDraftSelect(discord.ui.Select):
-    def __init__(self, proposals, bot):
-        self.proposals = proposals
+    def __init__(self, drafts, bot):
         self.bot = bot
         options = [
-            discord.SelectOption(label=proposal["title"], value=proposal["title"])
-            for proposal in self.proposals
+            discord.SelectOption(label=draft["title"], value=draft["draft_id"])
+            for draft in drafts
         ]
         super().__init__(placeholder="proposals..", options=options)
 
     async def callback(self, interaction: discord.Interaction):
-        # Find the selected proposal
-        for proposal in self.proposals:
-            if proposal["title"] == self.values[0]:
-                selected_proposal = proposal
-                break
-        else:
-            await interaction.response.send_message("Proposal not found.")
-            return
-
-        # Call handle_publishdraft
-        await handle_publishdraft(
-            interaction, selected_proposal["title"], self.proposals, self.bot
-        )
+        # Call handle_publishdraft with the selected draft
+        await handle_publishdraft(interaction, self.values[0], self.bot)
 
 
 class DeleteProposalSelect(discord.ui.Select):
-    def __init__(self, proposals):
-        self.proposals = proposals
+    def __init__(self, drafts):
         options = [
-            discord.SelectOption(label=proposal["title"], value=proposal["title"])
-            for proposal in self.proposals
+            discord.SelectOption(label=draft["title"], value=draft["draft_id"])
+            for draft in drafts
         ]
         super().__init__(placeholder="Select a proposal to delete", options=options)
 
     async def callback(self, interaction: discord.Interaction):
-        # Find the selected proposal
-        for index, proposal in enumerate(self.proposals):
-            if proposal["title"] == self.values[0]:
-                selected_proposal = proposal
-                del self.proposals[index]  # Delete the selected proposal from the list
-                e = discord.Embed(
-                    title=f'Proposal "{selected_proposal["title"]}" has been deleted',
-                    color=discord.Color.red(),
-                )
-                e.set_author(
-                    name="Proposal Deletion",
-                    icon_url=interaction.user.display_avatar.url,
-                )
-                await interaction.response.edit_message(content=" ", embed=e, view=None)
-                return
+        # Delete the selected proposal
+        selected_proposal = interaction.client.drafts.remove(
+            interaction.guild_id, self.values[0]
+        )
+        if selected_proposal is None:
+            await interaction.response.send_message("Proposal not found.")
+            return
 
-        await interaction.response.send_message("Proposal not found.")
+        e = discord.Embed(
+            title=f'Proposal "{selected_proposal["title"]}" has been deleted',
+            color=discord.Color.red(),
+        )
+        e.set_author(
+            name="Proposal Deletion",
+            icon_url=interaction.user.display_avatar.url,
+        )
+        await interaction.response.edit_message(content=" ", embed=e, view=None)
 
 
 class EditProposalSelect(discord.ui.Select):
-    def __init__(self, proposals):
-        self.proposals = proposals
+    def __init__(self, drafts):
         options = [
-            discord.SelectOption(label=proposal["title"], value=proposal["title"])
-            for proposal in self.proposals
+            discord.SelectOption(label=draft["title"], value=draft["draft_id"])
+            for draft in drafts
         ]
         super().__init__(placeholder="Select a proposal to edit", options=options)
 
     async def callback(self, interaction: discord.Interaction):
         # Find the selected proposal
-        for proposal in self.proposals:
-            if proposal["title"] == self.values[0]:
-                selected_proposal = proposal
-                break
-        else:
+        selected_proposal = interaction.client.drafts.get(
+            interaction.guild_id, self.values[0]
+        )
+        if selected_proposal is None:
             await interaction.response.send_message("Proposal not found.")
             return
 
@@ -9,27 +9,25 @@ The module contains the following functions:
 - publish_draft: Publish the draft by creating a thread with the prepared content and starting a vote timer.
 - react_to_vote: React to the published draft with the vote emojis.
 - vote_timer: Start a timer for the vote. After 48 hours, the vote is concluded and the result is posted.
+- reconcile_votes: Reconcile the vote ledger with the actual reactions on a vote message.
+- reconcile_ongoing_votes: Reconcile the vote ledger with the vote messages of every ongoing proposal.
 
-The module also contains the following variables:
-- proposals: A list of proposals.
-- ongoing_votes: A dictionary of ongoing votes.
+The drafts themselves are kept in bot.drafts, see proposals/draft_repository.py.
 """
 
 import time
 import discord
 import consts.constants as constants
-import config.config as cfg
 from logger.logger import logger
 from discord.ext.commands import Bot
 from discord.ext import commands
 from consts.types import GOVERNANCE_ID_TYPE, BUDGET_ID_TYPE
 from logger.logger import logger
 from typing import Any, Dict, List, Tuple
-from helpers.helpers import get_channel_by_name, update_ongoing_votes_file
+from helpers.helpers import get_channel_by_name, get_forum_channel_by_name
+from proposals.vote_ledger import VOTE_CHOICES
 
 
-proposals: List[Dict[str, Any]] = []
-
 async def handle_votedraft(
     ctx: commands.Context, proposals: List[Dict[str, str]], new_proposal_emoji: str
 ) -> None:
@@ -60,34 +58,25 @@ async def handle_votedraft(
 
 async def handle_publishdraft(
     interaction: discord.Interaction,
-    draft_name: str,
-    proposals: List[Dict[str, str]],
+    draft_id: str,
     bot: commands.Bot,
 ) -> None:
     """
     Handle the publishing of a draft.
 
-    This function searches for a draft with the given name in the list of proposals.
-    If the draft is found, it is published and removed from the list of proposals.
+    This function looks the draft up by its draft ID in bot.drafts.
+    If the draft is found, it is published and removed from the drafts.
     If the draft is not found, a message is sent to the interaction.
 
     Parameters:
     interaction (discord.Interaction): The interaction that triggered the command.
-    draft_name (str): The name of the draft to publish.
-    proposals (List[Dict[str, str]]): The list of proposals.
+    draft_id (str): The ID of the draft to publish.
     bot (commands.Bot): The bot instance.
 
     Returns:
     None
     """
-    draft_to_publish = next(
-        (
-            item
-            for item in proposals
-            if item.get("title", "").strip() == draft_name.strip()
-        ),
-        None,
-    )
+    draft_to_publish = bot.drafts.get(interaction.guild.id, draft_id)
 
     if draft_to_publish:
         embed = discord.Embed(
@@ -100,23 +89,24 @@ async def handle_publishdraft(
         )
         await interaction.response.send_message(embed=embed)
 
-        proposals.remove(draft_to_publish)
+        bot.drafts.remove(interaction.guild.id, draft_id)
         await publish_draft(
             draft_to_publish, bot, interaction.guild.id, interaction.guild
         )
     else:
-        await interaction.response.send_message(f"Draft not found: {draft_name}")
+        await interaction.response.send_message(f"Draft not found: {draft_id}")
 
 
 # prepare the draft by setting the type, channel ID, and title based on the draft type
 async def prepare_draft(
-    guild: discord.Guild, draft: Dict[str, Any]
+    bot: Bot, guild: discord.Guild, draft: Dict[str, Any]
 ) -> Tuple[str, str, str]:
     """
     Prepare the draft by setting the type, channel ID, and title based on the draft type.
-    Increment the current ID and update the config file.
+    The proposal ID is allocated from bot.id_allocator.
 
     Parameters:
+    bot (Bot): The bot instance.
     guild (discord.Guild): The guild to search for the channel in.
     draft (Dict[str, Any]): The draft to be prepared.
 
@@ -130,21 +120,13 @@ async def prepare_draft(
     if draft_type == BUDGET_ID_TYPE:
         id_type = BUDGET_ID_TYPE
         channel_name = constants.GOVERNANCE_BUDGET_CHANNEL
-        cfg.current_budget_id += 1
-        cfg.update_id_values(
-            cfg.current_budget_id, id_type
-        )  # Update the governance ID in the config file
-        title = (
-            f"Bloom Budget Proposal (BBP) #{cfg.current_budget_id}: {draft['title']}"
-        )
+        budget_id = await bot.id_allocator.allocate(id_type)
+        title = f"Bloom Budget Proposal (BBP) #{budget_id}: {draft['title']}"
     else:
         id_type = GOVERNANCE_ID_TYPE
         channel_name = constants.GOVERNANCE_CHANNEL
-        cfg.current_governance_id += 1
-        cfg.update_id_values(
-            cfg.current_governance_id, id_type
-        )  # Update the governance ID in the config file
-        title = f"Bloom General Proposal (BGP) #{cfg.current_governance_id}: {draft['title']}"
+        governance_id = await bot.id_allocator.allocate(id_type)
+        title = f"Bloom General Proposal (BGP) #{governance_id}: {draft['title']}"
 
     return id_type, channel_name, title
 
@@ -163,9 +145,9 @@ async def publish_draft(
     guild (discord.Guild): The guild to publish the draft in.
     """
     try:
-        id_type, channel_name, title = await prepare_draft(guild, draft)
-        forum_channel = discord.utils.get(
-            bot.get_guild(guild_id).channels, name=channel_name
+        id_type, channel_name, title = await prepare_draft(bot, guild, draft)
+        forum_channel = await get_forum_channel_by_name(
+            bot.get_guild(guild_id), channel_name
         )
         if not forum_channel:
             logger.error(
@@ -188,18 +170,25 @@ async def publish_draft(
             "end_time": time.time() + 48 * 60 * 60,  # 48 hours from now
             "yes_count": 0,
             "title": title,
+            "guild_id": str(guild_id),
             "channel_id": str(forum_channel.id),
             "thread_id": str(thread.thread.id),  # Add the thread ID
             "message_id": str(vote_message.id),  # Add the message ID
         }
 
+        # Tally the votes on the vote message as reactions come in
+        bot.vote_ledger.track(vote_message.id)
+
         # Update ongoing_votes with new proposal data
         if not hasattr(bot, "ongoing_votes"):
             bot.ongoing_votes = {}  # In case ongoing_votes is not initialized
         bot.ongoing_votes[proposal_id] = proposal_data
 
-        # Save to ongoing_votes.json
-        update_ongoing_votes_file(bot.ongoing_votes, cfg.ONGOING_VOTES_FILE_PATH)
+        # Persist the new proposal
+        bot.store.save_ongoing_vote(proposal_id, proposal_data)
+
+        # Conclude the proposal as soon as the vote ends
+        bot.proposal_scheduler.schedule(proposal_id, proposal_data["end_time"])
 
         await react_to_vote(vote_message.id, bot, guild_id, channel_name, thread.thread.id)
     except Exception as e:
@@ -214,7 +203,7 @@ async def react_to_vote(
         return
 
     # Fetch the channel by name
-    channel = discord.utils.get(guild.channels, name=channel_name)
+    channel = await get_forum_channel_by_name(guild, channel_name)
     if not channel:
         logger.error(f"Error: Channel with name {channel_name} not found.")
         return
@@ -230,4 +219,47 @@ async def react_to_vote(
 
     await message.add_reaction(constants.YES_VOTE)
     await message.add_reaction(constants.NO_VOTE)
-    await message.add_reaction(constants.ABSTAIN_VOTE)
\ No newline at end of file
+    await message.add_reaction(constants.ABSTAIN_VOTE)
+
+
+async def reconcile_votes(bot: Bot, message: discord.Message) -> None:
+    """
+    Reconcile the vote ledger with the actual reactions on a vote message.
+    This picks up any reactions that were added or removed while the bot was offline.
+
+    Parameters:
+    bot (Bot): The bot instance.
+    message (discord.Message): The vote message.
+    """
+    reactions = {}
+    for reaction in message.reactions:
+        emoji = str(reaction.emoji)
+        if emoji in VOTE_CHOICES:
+            # Ignore the bot's own reactions
+            reactions[emoji] = [
+                user.id async for user in reaction.users() if user.id != bot.user.id
+            ]
+
+    bot.vote_ledger.reconcile(message.id, reactions)
+
+
+async def reconcile_ongoing_votes(bot: Bot) -> None:
+    """
+    Reconcile the vote ledger with the vote messages of every ongoing proposal.
+
+    Parameters:
+    bot (Bot): The bot instance.
+    """
+    for proposal_id, proposal_data in list(bot.ongoing_votes.items()):
+        try:
+            thread = bot.get_channel(
+                int(proposal_data["thread_id"])
+            ) or await bot.fetch_channel(int(proposal_data["thread_id"]))
+            message = await thread.fetch_message(int(proposal_data["message_id"]))
+            await reconcile_votes(bot, message)
+        except discord.HTTPException as e:
+            logger.error(
+                f"Unable to reconcile the votes of proposal {proposal_id}: {e}"
+            )
+
+    logger.info(f"Reconciled the votes of {len(bot.ongoing_votes)} ongoing proposals")
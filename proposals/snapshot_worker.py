@@ -0,0 +1,201 @@
+"""
+snapshot_worker contains the SnapshotWorker, which creates Snapshot proposals through a long-lived Node process
+running snapshot/worker.js.
+
+Requests are written to the worker's stdin and responses read from its stdout as JSON lines, so the draft is never
+passed on the command line and the event loop is never blocked. Each request carries an ID that its response is
+matched to, is bounded by a timeout, and at most SNAPSHOT_CONCURRENCY requests are in flight at once.
+If the worker exits, the requests in flight fail and the worker is restarted on the next request.
+"""
+
+import asyncio
+import itertools
+import json
+import config.config as cfg
+from typing import Any, Dict, List, Optional
+from logger.logger import logger
+
+
+class SnapshotWorkerError(Exception):
+    pass
+
+
+class SnapshotWorker:
+    def __init__(
+        self,
+        script: str = cfg.SNAPSHOT_WORKER_SCRIPT,
+        timeout: float = cfg.SNAPSHOT_TIMEOUT,
+        concurrency: int = cfg.SNAPSHOT_CONCURRENCY,
+        restart_delay: float = cfg.SNAPSHOT_RESTART_DELAY,
+    ):
+        self.script = script
+        self.timeout = timeout
+        self.restart_delay = restart_delay
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._start_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._tasks: List[asyncio.Task] = []
+        self._restarts = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        """
+        Start the worker process if it is not already running.
+
+        Raises:
+        SnapshotWorkerError: If the worker process cannot be started.
+        """
+        async with self._start_lock:
+            if self.running:
+                return
+
+            if self._process is not None:
+                # Back off before restarting a worker that exited
+                self._restarts += 1
+                await asyncio.sleep(min(self.restart_delay * self._restarts, 60))
+
+            try:
+                self._process = await asyncio.create_subprocess_exec(
+                    "node",
+                    self.script,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=2**20,
+                )
+            except OSError as e:
+                raise SnapshotWorkerError(f"Unable to start the Snapshot worker: {e}")
+
+            logger.info(f"Started the Snapshot worker, pid {self._process.pid}")
+            # Each process gets its own pending requests, so a worker that exits only fails its own requests
+            self._pending = {}
+            self._tasks = [
+                asyncio.create_task(self._read_responses(self._process, self._pending)),
+                asyncio.create_task(self._read_logs(self._process)),
+            ]
+
+    async def stop(self) -> None:
+        """
+        Stop the worker process. Requests that are still in flight fail.
+        """
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), 5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._fail_pending(self._pending, "The Snapshot worker was stopped")
+
+    async def create_proposal(
+        self,
+        title: str,
+        abstract: str,
+        background: str,
+        additional: str,
+        choices: List[str],
+        idempotency_key: Optional[str] = None,
+    ) -> Any:
+        """
+        Create a Snapshot proposal.
+
+        Parameters:
+        title (str): The title of the proposal.
+        abstract (str): The abstract of the proposal.
+        background (str): The background of the proposal.
+        additional (str): The additional information of the proposal.
+        choices (List[str]): The voting choices.
+        idempotency_key (Optional[str]): If given, the worker creates the proposal at most once for this key, and a retry
+            after a timeout waits for the original request instead of creating a second proposal.
+
+        Returns:
+        Any: The receipt returned by the Snapshot hub.
+
+        Raises:
+        SnapshotWorkerError: If the proposal could not be created, or the request timed out.
+        """
+        return await self.request(
+            {
+                "title": title,
+                "abstract": abstract,
+                "background": background,
+                "additional": additional,
+                "choices": choices,
+                "idempotency_key": idempotency_key,
+            }
+        )
+
+    async def request(self, payload: Dict[str, Any]) -> Any:
+        async with self._semaphore:
+            await self.start()
+
+            request_id = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            pending = self._pending
+            pending[request_id] = future
+
+            try:
+                line = json.dumps({"id": request_id, **payload}) + "\n"
+                self._process.stdin.write(line.encode())
+                await self._process.stdin.drain()
+                response = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                raise SnapshotWorkerError(
+                    f"Snapshot request {request_id} timed out after {self.timeout}s"
+                )
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise SnapshotWorkerError(f"The Snapshot worker is not running: {e}")
+            finally:
+                pending.pop(request_id, None)
+
+        self._restarts = 0
+        if not response.get("ok"):
+            raise SnapshotWorkerError(response.get("error", "Unknown error"))
+        return response.get("result")
+
+    async def _read_responses(
+        self,
+        process: asyncio.subprocess.Process,
+        pending: Dict[int, asyncio.Future],
+    ) -> None:
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Unexpected output from the Snapshot worker: {line!r}")
+                continue
+
+            future = pending.get(response.get("id"))
+            if future is not None and not future.done():
+                future.set_result(response)
+
+        await process.wait()
+        if process is self._process:
+            logger.warning(
+                f"The Snapshot worker exited with code {process.returncode}, it will be restarted on the next request"
+            )
+        self._fail_pending(pending, "The Snapshot worker exited")
+
+    async def _read_logs(self, process: asyncio.subprocess.Process) -> None:
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            logger.info(f"Snapshot worker: {line.decode(errors='replace').rstrip()}")
+
+    def _fail_pending(self, pending: Dict[int, asyncio.Future], reason: str) -> None:
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(SnapshotWorkerError(reason))
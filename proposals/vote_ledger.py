@@ -0,0 +1,162 @@
+"""
+vote_ledger contains the VoteLedger, which keeps live vote tallies for the vote messages of ongoing proposals.
+
+The ledger is updated from raw reaction events, and records every vote reaction of every voter. A voter who
+reacts with several vote emojis still has a single effective vote, the most recent reaction they have not
+removed, so the tallies count each member once. Tallies are maintained incrementally, and every change is
+persisted to the store as a single row, so they are available at any time and survive restarts.
+Reactions added or removed while the bot was offline are picked up by reconcile.
+"""
+
+import consts.constants as constants
+from typing import Dict, Iterable, List, Set
+from storage.storage import Store
+
+VOTE_CHOICES = (constants.YES_VOTE, constants.NO_VOTE, constants.ABSTAIN_VOTE)
+
+
+class VoteLedger:
+    def __init__(self, store: Store, message_ids: Iterable[int] = ()):
+        self.store = store
+        # message ID -> voter ID -> the vote reactions of the voter, oldest first
+        self.votes: Dict[int, Dict[int, List[str]]] = {}
+        # message ID -> vote choice -> number of effective votes
+        self.tallies: Dict[int, Dict[str, int]] = {}
+        # message IDs whose reactions have been reconciled since startup
+        self.reconciled: Set[int] = set()
+
+        for message_id in message_ids:
+            self.track(message_id)
+
+        for message_id, voter_id, choice in store.load_vote_ledger():
+            if message_id in self.votes:
+                self._apply_add(message_id, voter_id, choice)
+
+    def is_tracked(self, message_id: int) -> bool:
+        return message_id in self.votes
+
+    def track(self, message_id: int) -> None:
+        """
+        Start tracking the votes on a vote message.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+        """
+        self.votes.setdefault(message_id, {})
+        self.tallies.setdefault(message_id, {choice: 0 for choice in VOTE_CHOICES})
+
+    def untrack(self, message_id: int) -> None:
+        """
+        Stop tracking the votes on a vote message and forget them.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+        """
+        self.votes.pop(message_id, None)
+        self.tallies.pop(message_id, None)
+        self.reconciled.discard(message_id)
+        self.store.remove_votes(message_id)
+
+    def tally(self, message_id: int) -> Dict[str, int]:
+        """
+        Get the number of effective votes for each choice.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+
+        Returns:
+        Dict[str, int]: The number of votes, keyed by vote emoji.
+        """
+        return dict(self.tallies[message_id])
+
+    def add_reaction(self, message_id: int, voter_id: int, choice: str) -> None:
+        """
+        Record a vote reaction. Reactions on untracked messages, or with emojis that are not vote choices, are ignored.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+        voter_id (int): The ID of the member who reacted.
+        choice (str): The emoji of the reaction.
+        """
+        if message_id in self.votes and choice in VOTE_CHOICES:
+            if self._apply_add(message_id, voter_id, choice):
+                self.store.add_vote(message_id, voter_id, choice)
+
+    def remove_reaction(self, message_id: int, voter_id: int, choice: str) -> None:
+        """
+        Forget a vote reaction. The voter's previous reaction, if any, becomes their effective vote again.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+        voter_id (int): The ID of the member who removed their reaction.
+        choice (str): The emoji of the reaction.
+        """
+        if message_id in self.votes and choice in VOTE_CHOICES:
+            if self._apply_remove(message_id, voter_id, choice):
+                self.store.remove_vote(message_id, voter_id, choice)
+
+    def reconcile(self, message_id: int, reactions: Dict[str, List[int]]) -> None:
+        """
+        Replace the recorded reactions on a vote message with its actual reactions.
+        The order of the reactions that were already recorded is kept, new reactions are added after them.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+        reactions (Dict[str, List[int]]): The IDs of the members who reacted, keyed by vote emoji.
+        """
+        if message_id not in self.votes:
+            return
+
+        actual = {
+            (voter_id, choice)
+            for choice, voter_ids in reactions.items()
+            if choice in VOTE_CHOICES
+            for voter_id in voter_ids
+        }
+        recorded = {
+            (voter_id, choice)
+            for voter_id, choices in self.votes[message_id].items()
+            for choice in choices
+        }
+
+        for voter_id, choice in recorded - actual:
+            self._apply_remove(message_id, voter_id, choice)
+        for voter_id, choice in actual - recorded:
+            self._apply_add(message_id, voter_id, choice)
+
+        self.store.replace_votes(
+            message_id,
+            [
+                (voter_id, choice)
+                for voter_id, choices in self.votes[message_id].items()
+                for choice in choices
+            ],
+        )
+        self.reconciled.add(message_id)
+
+    def _apply_add(self, message_id: int, voter_id: int, choice: str) -> bool:
+        choices = self.votes[message_id].setdefault(voter_id, [])
+        if choice in choices:
+            return False
+
+        tally = self.tallies[message_id]
+        if choices:
+            tally[choices[-1]] -= 1
+        choices.append(choice)
+        tally[choice] += 1
+        return True
+
+    def _apply_remove(self, message_id: int, voter_id: int, choice: str) -> bool:
+        choices = self.votes[message_id].get(voter_id)
+        if not choices or choice not in choices:
+            return False
+
+        tally = self.tallies[message_id]
+        if choices[-1] == choice:
+            tally[choice] -= 1
+            if len(choices) > 1:
+                tally[choices[-2]] += 1
+        choices.remove(choice)
+        if not choices:
+            del self.votes[message_id][voter_id]
+        return True
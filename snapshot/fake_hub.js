@@ -0,0 +1,69 @@
+/**
+ * A local stand-in for the Snapshot hub and the Ethereum RPC, so the worker can be exercised offline.
+ *
+ * Usage:
+ *   node snapshot/fake_hub.js [port]
+ *
+ * Then start the bot, or worker.js, with:
+ *   SNAPSHOT_HUB_URL=http://127.0.0.1:<port> SNAPSHOT_RPC_URL=http://127.0.0.1:<port>
+ *
+ * POST /api/msg accepts any signed message and returns a fake receipt, every other POST is answered as a JSON-RPC
+ * request. Each received proposal is logged to stdout.
+ */
+const http = require('http');
+
+const port = Number(process.argv[2] || 8545);
+const chainId = 42161;
+let blockNumber = 1000;
+let proposals = 0;
+
+function rpcResult(method) {
+  switch (method) {
+    case 'eth_chainId':
+      return `0x${chainId.toString(16)}`;
+    case 'net_version':
+      return String(chainId);
+    case 'eth_blockNumber':
+      blockNumber += 1;
+      return `0x${blockNumber.toString(16)}`;
+    default:
+      return null;
+  }
+}
+
+function handleRpc(request) {
+  if (Array.isArray(request)) {
+    return request.map(handleRpc);
+  }
+  return { jsonrpc: '2.0', id: request.id, result: rpcResult(request.method) };
+}
+
+const server = http.createServer((req, res) => {
+  let body = '';
+  req.on('data', (chunk) => {
+    body += chunk;
+  });
+  req.on('end', () => {
+    let response;
+    try {
+      const request = body ? JSON.parse(body) : {};
+      if (req.url.startsWith('/api/msg')) {
+        proposals += 1;
+        console.log(`Received proposal #${proposals}: ${request.data && request.data.message && request.data.message.title}`);
+        response = { id: `0xfake${proposals.toString(16).padStart(60, '0')}`, ipfs: 'fake', relayer: { address: '0x0', receipt: 'fake' } };
+      } else {
+        response = handleRpc(request);
+      }
+    } catch (error) {
+      res.writeHead(400, { 'Content-Type': 'application/json' });
+      res.end(JSON.stringify({ error: error.message }));
+      return;
+    }
+    res.writeHead(200, { 'Content-Type': 'application/json' });
+    res.end(JSON.stringify(response));
+  });
+});
+
+server.listen(port, '127.0.0.1', () => {
+  console.log(`Fake Snapshot hub and RPC listening on http://127.0.0.1:${port}`);
+});
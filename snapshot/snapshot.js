@@ -5,7 +5,9 @@
  * The environment variables ETH_ADDRESS and ETH_PRIVATE_KEY must be set in a .env file.
  * The ETH_ADDRESS is the address of the account that will create the proposal.
  * The ETH_PRIVATE_KEY is the private key of the ETH_ADDRESS account.
- * wrapper.js is responsible for calling this function with the correct arguments.
+ * The RPC and hub URLs default to Arbitrum and hub.snapshot.org, and can be overridden with SNAPSHOT_RPC_URL and
+ * SNAPSHOT_HUB_URL, for example to point at fake_hub.js when testing offline.
+ * worker.js and wrapper.js are responsible for calling this function with the correct arguments.
  */
 const { ethers } = require('ethers');
 const snapshot = require('@snapshot-labs/snapshot.js');
@@ -19,6 +21,7 @@ dotenv.config();
  * @param {*} abstract  - The abstract of the proposal
  * @param {*} background - The background of the proposal
  * @param {*} choices - The choices for the proposal
+ * @returns {Promise<*>} The receipt returned by the hub
  */
 async function createProposal(title, abstract, background, additional, choices) {
   try {
@@ -29,11 +32,11 @@ async function createProposal(title, abstract, background, additional, choices)
       throw new Error('Ethereum address or private key not provided in environment variables');
     }
 
-    const provider = new ethers.providers.JsonRpcProvider('https://arbitrum.llamarpc.com');
+    const provider = new ethers.providers.JsonRpcProvider(process.env.SNAPSHOT_RPC_URL || 'https://arbitrum.llamarpc.com');
 
     const wallet = new ethers.Wallet(ethPrivateKey, provider);
 
-    const hub = 'https://hub.snapshot.org';
+    const hub = process.env.SNAPSHOT_HUB_URL || 'https://hub.snapshot.org';
 
     // Initialize Snapshot client
     const client = new snapshot.Client712(hub);
@@ -61,8 +64,10 @@ async function createProposal(title, abstract, background, additional, choices)
 
     // Log the receipt details
     console.log('Proposal submitted. Receipt:', receipt);
+    return receipt;
   } catch (error) {
     console.error('Error creating proposal:', error);
+    throw error;
   }
 }
 
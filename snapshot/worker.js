@@ -0,0 +1,75 @@
+/**
+ * This is a long-lived worker for the createProposal function defined in snapshot.js.
+ * It is started once by the bot (see proposals/snapshot_worker.py), which saves the Node start up on every proposal.
+ *
+ * Requests are read from stdin and responses are written to stdout, one JSON object per line:
+ *
+ *   request:  {"id": 1, "title": "...", "abstract": "...", "background": "...", "additional": "...", "choices": ["Adopt", "Reassess", "Abstain"]}
+ *   response: {"id": 1, "ok": true, "result": <receipt>}
+ *         or: {"id": 1, "ok": false, "error": "<message>"}
+ *
+ * Requests are processed concurrently, the bot limits how many are in flight at once.
+ * Requests with the same idempotency_key share a single createProposal call for the lifetime of the worker, so a
+ * retry after a timeout waits for the original call rather than creating the proposal twice. Failed calls are forgotten.
+ * Anything logged by snapshot.js is redirected to stderr, so stdout only ever carries responses.
+ * The worker exits when stdin is closed.
+ */
+const readline = require('readline');
+
+console.log = console.error;
+
+const createProposal = require('./snapshot.js');
+
+// idempotency key -> promise of the createProposal call
+const calls = new Map();
+
+function create(request) {
+  const key = request.idempotency_key;
+  if (key && calls.has(key)) {
+    return calls.get(key);
+  }
+
+  const call = createProposal(
+    request.title,
+    request.abstract,
+    request.background,
+    request.additional,
+    request.choices
+  );
+  if (key) {
+    calls.set(key, call);
+    call.catch(() => calls.delete(key));
+  }
+  return call;
+}
+
+function respond(response) {
+  process.stdout.write(JSON.stringify(response) + '\n');
+}
+
+async function handle(line) {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    respond({ id: null, ok: false, error: `Invalid request: ${error.message}` });
+    return;
+  }
+
+  try {
+    const result = await create(request);
+    respond({ id: request.id, ok: true, result: result === undefined ? null : result });
+  } catch (error) {
+    respond({ id: request.id, ok: false, error: String((error && error.message) || error) });
+  }
+}
+
+const input = readline.createInterface({ input: process.stdin });
+
+input.on('line', (line) => {
+  if (line.trim()) {
+    handle(line);
+  }
+});
+
+input.on('close', () => process.exit(0));
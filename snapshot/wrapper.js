@@ -8,8 +8,8 @@
  * 3. Background of the proposal
  * 4. Choices for the proposal (arbitrary number of choices can be provided)
  * 
- * This wrapper is called from the gov/proposals.py Python script using the subprocess.run function.
- * The arguments are passed in the following order: ["node", "./snapshot/wrapper.js", title, abstract, background, "Yes", "No", "Abstain"]
+ * The bot uses worker.js instead, this wrapper is kept for creating a proposal by hand:
+ * node ./snapshot/wrapper.js title abstract background additional Adopt Reassess Abstain
  * 
  * If the createProposal function throws an error, the error is logged and the process exits with a status code of 1.
  */
@@ -0,0 +1,817 @@
+"""
+storage/storage.py is responsible for persisting the bot's state.
+State is kept in a SQLite database in WAL mode, so every change is a small transaction that only
+touches the affected rows, and a crash mid-write can never leave a partially written file behind.
+A commit only appends the changed pages to the write-ahead log, and the log is folded back into the
+database file by a checkpoint. Automatic checkpoints are deferred to WAL_AUTOCHECKPOINT pages, as the
+checkpoint_store task in tasks/tasks.py checkpoints the log in the background once it grows past
+CHECKPOINT_WAL_SIZE, keeping that work off the commits themselves. Those checkpoints never wait for other
+connections, so a reader in another process can never stall the event loop, and the log is truncated back
+to half of CHECKPOINT_WAL_SIZE whenever it is reset, so a log that has been reset stays below the threshold
+until it has really grown again.
+
+The Store class exposes a small repository API for each kind of state:
+- posted events: the scheduled events that have already been announced, with their start and end time.
+- announcement jobs: the newly created events that are still to be announced, with when to announce them.
+- interest rosters: the users interested in each scheduled event.
+- sequences: the last reserved ID of each proposal ID type.
+- drafts: the draft proposals of each guild.
+- ongoing votes: the proposals that are currently being voted on.
+- vote ledger: the vote reactions on the vote message of each ongoing proposal.
+- conclusion outbox: the pending side effects of concluded proposals, and the steps of them that succeeded.
+- contributors: the contributors and emoji dictionary of each guild, and those stored by server name by
+  earlier versions, which are adopted by the guild with that name when it is first loaded.
+
+The JSON files used by earlier versions of the bot are migrated into the database automatically
+the first time the Store is opened.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+import config.config as cfg
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from logger.logger import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posted_events (
+    event_id INTEGER PRIMARY KEY,
+    start_time REAL,
+    end_time REAL
+);
+CREATE TABLE IF NOT EXISTS announcement_jobs (
+    event_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    due REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_rosters (
+    event_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_interest (
+    event_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (event_id, user_id)
+);
+CREATE TABLE IF NOT EXISTS drafts (
+    draft_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ongoing_votes (
+    proposal_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vote_ledger (
+    message_id INTEGER NOT NULL,
+    voter_id INTEGER NOT NULL,
+    choice TEXT NOT NULL,
+    PRIMARY KEY (message_id, voter_id, choice)
+);
+CREATE TABLE IF NOT EXISTS conclusion_jobs (
+    proposal_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conclusion_steps (
+    idempotency_key TEXT PRIMARY KEY,
+    proposal_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guild_contributors (
+    guild_id INTEGER NOT NULL,
+    uid TEXT NOT NULL,
+    note TEXT NOT NULL,
+    PRIMARY KEY (guild_id, uid)
+);
+CREATE TABLE IF NOT EXISTS guild_contributor_emojis (
+    guild_id INTEGER NOT NULL,
+    emoji_id TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    PRIMARY KEY (guild_id, emoji_id)
+);
+-- Contributors stored by earlier versions, keyed by server name until their guild adopts them
+CREATE TABLE IF NOT EXISTS contributors (
+    server TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    note TEXT NOT NULL,
+    PRIMARY KEY (server, uid)
+);
+CREATE TABLE IF NOT EXISTS contributor_emojis (
+    server TEXT NOT NULL,
+    emoji_id TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    PRIMARY KEY (server, emoji_id)
+);
+"""
+
+
+class Store:
+    def __init__(self, path: str = cfg.DATABASE_FILE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(f"PRAGMA wal_autocheckpoint={cfg.WAL_AUTOCHECKPOINT}")
+        self.connection.execute(
+            f"PRAGMA journal_size_limit={cfg.CHECKPOINT_WAL_SIZE // 2}"
+        )
+        # (size, modification time) of the write-ahead log after the last complete checkpoint
+        self._checkpointed_wal: Optional[Tuple[int, int]] = None
+        self.connection.executescript(SCHEMA)
+        self._add_missing_columns()
+
+    def transaction(self) -> "_Transaction":
+        """
+        Return a context manager that wraps the statements executed inside it in a single transaction.
+        """
+        return _Transaction(self.connection)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def wal_size(self) -> int:
+        """
+        Get the size of the write-ahead log in bytes, 0 if there is none or if nothing was written to it since
+        the last complete checkpoint.
+        """
+        wal = self._wal_stat()
+        if wal is None or wal == self._checkpointed_wal:
+            return 0
+        return wal[0]
+
+    def _wal_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path + "-wal")
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def checkpoint(self, truncate: bool = False) -> bool:
+        """
+        Fold the write-ahead log into the database file without waiting for other connections.
+
+        Parameters:
+        truncate (bool): Also truncate the log to zero bytes, which needs every other connection to be idle.
+
+        Returns:
+        bool: True if every frame of the log was checkpointed, False if other connections held some of them back.
+        """
+        if not truncate:
+            busy, log_frames, checkpointed_frames = self.connection.execute(
+                "PRAGMA wal_checkpoint(PASSIVE)"
+            ).fetchone()
+            completed = not busy and log_frames == checkpointed_frames
+        else:
+            # TRUNCATE waits on the busy handler, disable it so a busy database fails fast instead
+            (busy_timeout,) = self.connection.execute("PRAGMA busy_timeout").fetchone()
+            self.connection.execute("PRAGMA busy_timeout=0")
+            try:
+                busy, _, _ = self.connection.execute(
+                    "PRAGMA wal_checkpoint(TRUNCATE)"
+                ).fetchone()
+            finally:
+                self.connection.execute(f"PRAGMA busy_timeout={busy_timeout}")
+            completed = not busy
+
+        if completed:
+            self._checkpointed_wal = self._wal_stat()
+        return completed
+
+    @contextmanager
+    def _synchronous_full(self) -> Iterator[None]:
+        """
+        Commit the statements executed inside it with synchronous=FULL, so they are on disk once it exits.
+        """
+        self.connection.execute("PRAGMA synchronous=FULL")
+        try:
+            yield
+        finally:
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+
+    def _add_missing_columns(self) -> None:
+        """
+        Add the columns introduced after a table was first created to databases created by earlier versions.
+        """
+        columns = {
+            "posted_events": [("start_time", "REAL"), ("end_time", "REAL")],
+        }
+        for table, table_columns in columns.items():
+            existing = {
+                row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")
+            }
+            for name, column_type in table_columns:
+                if name not in existing:
+                    self.connection.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"
+                    )
+
+    # Posted events
+
+    def load_posted_events(
+        self,
+    ) -> Dict[int, Tuple[Optional[float], Optional[float]]]:
+        """
+        Load the events that have already been posted to Discord.
+
+        Returns:
+        Dict[int, Tuple[Optional[float], Optional[float]]]: The start and end time of each posted event, keyed by event ID.
+        """
+        rows = self.connection.execute(
+            "SELECT event_id, start_time, end_time FROM posted_events"
+        )
+        return {
+            event_id: (start_time, end_time) for event_id, start_time, end_time in rows
+        }
+
+    def save_posted_events(
+        self,
+        added: Dict[int, Tuple[Optional[float], Optional[float]]],
+        removed: Iterable[int],
+    ) -> None:
+        """
+        Record newly posted events and forget expired ones in a single transaction.
+
+        Parameters:
+        added (Dict[int, Tuple[Optional[float], Optional[float]]]): The start and end time of each newly posted event, keyed by event ID.
+        removed (Iterable[int]): The IDs of the events to forget.
+        """
+        with self.transaction():
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO posted_events (event_id, start_time, end_time) VALUES (?, ?, ?)",
+                [
+                    (event_id, start_time, end_time)
+                    for event_id, (start_time, end_time) in added.items()
+                ],
+            )
+            self.connection.executemany(
+                "DELETE FROM posted_events WHERE event_id = ?",
+                [(event_id,) for event_id in removed],
+            )
+
+    # Announcement jobs
+
+    def load_announcement_jobs(self) -> Dict[int, Tuple[int, float]]:
+        """
+        Load the pending announcements of newly created events.
+
+        Returns:
+        Dict[int, Tuple[int, float]]: The guild ID and due time of each announcement, keyed by event ID.
+        """
+        rows = self.connection.execute(
+            "SELECT event_id, guild_id, due FROM announcement_jobs"
+        )
+        return {event_id: (guild_id, due) for event_id, guild_id, due in rows}
+
+    def save_announcement_job(self, event_id: int, guild_id: int, due: float) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "INSERT OR REPLACE INTO announcement_jobs (event_id, guild_id, due) VALUES (?, ?, ?)",
+                (event_id, guild_id, due),
+            )
+
+    def remove_announcement_job(self, event_id: int) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM announcement_jobs WHERE event_id = ?", (event_id,)
+            )
+
+    # Interest rosters
+
+    def load_event_rosters(self) -> Dict[int, Tuple[int, Set[int]]]:
+        """
+        Load the interest roster of every event.
+
+        Returns:
+        Dict[int, Tuple[int, Set[int]]]: The guild ID and the IDs of the interested users of each event, keyed by event ID.
+        """
+        rosters = {
+            event_id: (guild_id, set())
+            for event_id, guild_id in self.connection.execute(
+                "SELECT event_id, guild_id FROM event_rosters"
+            )
+        }
+        for event_id, user_id in self.connection.execute(
+            "SELECT event_id, user_id FROM event_interest"
+        ):
+            if event_id in rosters:
+                rosters[event_id][1].add(user_id)
+        return rosters
+
+    def replace_event_roster(
+        self, event_id: int, guild_id: int, user_ids: Iterable[int]
+    ) -> None:
+        """
+        Replace the interest roster of an event.
+
+        Parameters:
+        event_id (int): The ID of the event.
+        guild_id (int): The ID of the guild of the event.
+        user_ids (Iterable[int]): The IDs of the interested users.
+        """
+        with self.transaction():
+            self.remove_event_roster(event_id)
+            self.connection.execute(
+                "INSERT INTO event_rosters (event_id, guild_id) VALUES (?, ?)",
+                (event_id, guild_id),
+            )
+            self.connection.executemany(
+                "INSERT INTO event_interest (event_id, user_id) VALUES (?, ?)",
+                [(event_id, user_id) for user_id in user_ids],
+            )
+
+    def add_event_interest(self, event_id: int, user_id: int) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "INSERT OR IGNORE INTO event_interest (event_id, user_id) VALUES (?, ?)",
+                (event_id, user_id),
+            )
+
+    def remove_event_interest(self, event_id: int, user_id: int) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM event_interest WHERE event_id = ? AND user_id = ?",
+                (event_id, user_id),
+            )
+
+    def remove_event_roster(self, event_id: int) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM event_rosters WHERE event_id = ?", (event_id,)
+            )
+            self.connection.execute(
+                "DELETE FROM event_interest WHERE event_id = ?", (event_id,)
+            )
+
+    # Sequences
+
+    def load_sequences(self) -> Dict[str, int]:
+        """
+        Load the last reserved value of every sequence.
+
+        Returns:
+        Dict[str, int]: The last reserved value, keyed by sequence name.
+        """
+        return dict(self.connection.execute("SELECT name, value FROM sequences"))
+
+    def seed_sequence(self, name: str, value: int) -> int:
+        """
+        Durably create a sequence, unless it already exists. A sequence that another process created in the meantime
+        keeps its value, so seeding never resets values that have already been reserved.
+
+        Parameters:
+        name (str): The name of the sequence.
+        value (int): The initial last reserved value.
+
+        Returns:
+        int: The last reserved value of the sequence as stored.
+        """
+        with self._synchronous_full(), self.transaction():
+            self.connection.execute(
+                "INSERT OR IGNORE INTO sequences (name, value) VALUES (?, ?)",
+                (name, value),
+            )
+            (value,) = self.connection.execute(
+                "SELECT value FROM sequences WHERE name = ?", (name,)
+            ).fetchone()
+        return value
+
+    def reserve_sequence(self, name: str, count: int) -> int:
+        """
+        Durably advance a sequence by count values. The read and the write happen in one transaction, so processes
+        sharing the database never reserve the same values.
+
+        Parameters:
+        name (str): The name of the sequence.
+        count (int): The number of values to reserve.
+
+        Returns:
+        int: The last reserved value, the reserved values are the count values up to and including it.
+        """
+        with self._synchronous_full(), self.transaction():
+            self.connection.execute(
+                "UPDATE sequences SET value = value + ? WHERE name = ?", (count, name)
+            )
+            (value,) = self.connection.execute(
+                "SELECT value FROM sequences WHERE name = ?", (name,)
+            ).fetchone()
+        return value
+
+    # Drafts
+
+    def load_drafts(self) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Load every draft, in order of creation.
+
+        Returns:
+        List[Tuple[int, int, Dict[str, Any]]]: The draft ID, guild ID and data of each draft.
+        """
+        rows = self.connection.execute(
+            "SELECT draft_id, guild_id, data FROM drafts ORDER BY draft_id"
+        )
+        return [
+            (draft_id, guild_id, json.loads(data)) for draft_id, guild_id, data in rows
+        ]
+
+    def insert_draft(self, guild_id: int, data: Dict[str, Any]) -> int:
+        """
+        Insert a draft.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        data (Dict[str, Any]): The data of the draft.
+
+        Returns:
+        int: The ID of the new draft.
+        """
+        with self.transaction():
+            cursor = self.connection.execute(
+                "INSERT INTO drafts (guild_id, data) VALUES (?, ?)",
+                (guild_id, json.dumps(data)),
+            )
+        return cursor.lastrowid
+
+    def update_draft(self, draft_id: int, data: Dict[str, Any]) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "UPDATE drafts SET data = ? WHERE draft_id = ?",
+                (json.dumps(data), draft_id),
+            )
+
+    def remove_draft(self, draft_id: int) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM drafts WHERE draft_id = ?", (draft_id,)
+            )
+
+    # Ongoing votes
+
+    def load_ongoing_votes(self) -> Dict[str, Any]:
+        """
+        Load the ongoing votes.
+
+        Returns:
+        Dict[str, Any]: The dictionary of ongoing votes, keyed by proposal ID.
+        """
+        rows = self.connection.execute("SELECT proposal_id, data FROM ongoing_votes")
+        return {proposal_id: json.loads(data) for proposal_id, data in rows}
+
+    def save_ongoing_vote(
+        self, proposal_id: str, proposal_data: Dict[str, Any]
+    ) -> None:
+        """
+        Insert or replace a single ongoing vote.
+
+        Parameters:
+        proposal_id (str): The ID of the proposal.
+        proposal_data (Dict[str, Any]): The data of the proposal.
+        """
+        with self.transaction():
+            self.connection.execute(
+                "INSERT OR REPLACE INTO ongoing_votes (proposal_id, data) VALUES (?, ?)",
+                (proposal_id, json.dumps(proposal_data)),
+            )
+
+    def remove_ongoing_vote(self, proposal_id: str) -> None:
+        """
+        Remove a single ongoing vote.
+
+        Parameters:
+        proposal_id (str): The ID of the proposal to remove.
+        """
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM ongoing_votes WHERE proposal_id = ?", (proposal_id,)
+            )
+
+    # Vote ledger
+
+    def load_vote_ledger(self) -> List[Tuple[int, int, str]]:
+        """
+        Load every recorded vote reaction, in the order they were recorded.
+
+        Returns:
+        List[Tuple[int, int, str]]: The message ID, voter ID and choice of each vote reaction.
+        """
+        return self.connection.execute(
+            "SELECT message_id, voter_id, choice FROM vote_ledger ORDER BY rowid"
+        ).fetchall()
+
+    def add_vote(self, message_id: int, voter_id: int, choice: str) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "INSERT OR IGNORE INTO vote_ledger (message_id, voter_id, choice) VALUES (?, ?, ?)",
+                (message_id, voter_id, choice),
+            )
+
+    def remove_vote(self, message_id: int, voter_id: int, choice: str) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM vote_ledger WHERE message_id = ? AND voter_id = ? AND choice = ?",
+                (message_id, voter_id, choice),
+            )
+
+    def replace_votes(self, message_id: int, votes: List[Tuple[int, str]]) -> None:
+        """
+        Replace the recorded vote reactions on a vote message.
+
+        Parameters:
+        message_id (int): The ID of the vote message.
+        votes (List[Tuple[int, str]]): The voter ID and choice of each vote reaction, in order.
+        """
+        with self.transaction():
+            self.remove_votes(message_id)
+            self.connection.executemany(
+                "INSERT INTO vote_ledger (message_id, voter_id, choice) VALUES (?, ?, ?)",
+                [(message_id, voter_id, choice) for voter_id, choice in votes],
+            )
+
+    def remove_votes(self, message_id: int) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM vote_ledger WHERE message_id = ?", (message_id,)
+            )
+
+    # Conclusion outbox
+
+    def load_conclusion_jobs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the pending conclusion jobs.
+
+        Returns:
+        Dict[str, Dict[str, Any]]: The data, attempts, next_attempt and completed step keys of each job, keyed by proposal ID.
+        """
+        jobs = {
+            proposal_id: {
+                "data": json.loads(data),
+                "attempts": attempts,
+                "next_attempt": next_attempt,
+                "completed": set(),
+            }
+            for proposal_id, data, attempts, next_attempt in self.connection.execute(
+                "SELECT proposal_id, data, attempts, next_attempt FROM conclusion_jobs"
+            )
+        }
+        for idempotency_key, proposal_id in self.connection.execute(
+            "SELECT idempotency_key, proposal_id FROM conclusion_steps"
+        ):
+            if proposal_id in jobs:
+                jobs[proposal_id]["completed"].add(idempotency_key)
+        return jobs
+
+    def save_conclusion_job(
+        self,
+        proposal_id: str,
+        data: Dict[str, Any],
+        attempts: int,
+        next_attempt: float,
+    ) -> None:
+        """
+        Insert or replace a conclusion job.
+
+        Parameters:
+        proposal_id (str): The ID of the proposal.
+        data (Dict[str, Any]): Everything the steps of the job need.
+        attempts (int): The number of failed attempts so far.
+        next_attempt (float): The UNIX timestamp of the next attempt.
+        """
+        with self.transaction():
+            self.connection.execute(
+                "INSERT OR REPLACE INTO conclusion_jobs (proposal_id, data, attempts, next_attempt) VALUES (?, ?, ?, ?)",
+                (proposal_id, json.dumps(data), attempts, next_attempt),
+            )
+
+    def complete_conclusion_step(self, proposal_id: str, idempotency_key: str) -> None:
+        with self.transaction():
+            self.connection.execute(
+                "INSERT OR IGNORE INTO conclusion_steps (idempotency_key, proposal_id) VALUES (?, ?)",
+                (idempotency_key, proposal_id),
+            )
+
+    def remove_conclusion_job(self, proposal_id: str) -> None:
+        """
+        Remove a conclusion job and the record of its completed steps.
+
+        Parameters:
+        proposal_id (str): The ID of the proposal.
+        """
+        with self.transaction():
+            self.connection.execute(
+                "DELETE FROM conclusion_jobs WHERE proposal_id = ?", (proposal_id,)
+            )
+            self.connection.execute(
+                "DELETE FROM conclusion_steps WHERE proposal_id = ?", (proposal_id,)
+            )
+
+    # Contributors
+
+    def load_guild_contributors(
+        self, guild_id: int
+    ) -> Tuple[List[Dict[str, str]], Dict[str, str]]:
+        """
+        Load the contributors and emoji dictionary of a guild.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+
+        Returns:
+        Tuple[List[Dict[str, str]], Dict[str, str]]: The contributors and emoji dictionary.
+        """
+        contributors = [
+            {"uid": uid, "note": note}
+            for uid, note in self.connection.execute(
+                "SELECT uid, note FROM guild_contributors WHERE guild_id = ? ORDER BY rowid",
+                (guild_id,),
+            )
+        ]
+        emoji_dict = dict(
+            self.connection.execute(
+                "SELECT emoji_id, uid FROM guild_contributor_emojis WHERE guild_id = ? ORDER BY rowid",
+                (guild_id,),
+            )
+        )
+        return contributors, emoji_dict
+
+    def load_legacy_contributor_servers(self) -> List[str]:
+        """
+        Load the server names that contributors stored by earlier versions are still keyed by.
+
+        Returns:
+        List[str]: The server names.
+        """
+        return [
+            server
+            for (server,) in self.connection.execute(
+                "SELECT server FROM contributors UNION SELECT server FROM contributor_emojis"
+            )
+        ]
+
+    def adopt_contributors(self, guild_id: int, server: str) -> Tuple[int, int]:
+        """
+        Move the contributors stored under a server name by earlier versions to a guild.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        server (str): The name the contributors were stored under.
+
+        Returns:
+        Tuple[int, int]: The number of contributors and the number of emojis adopted.
+        """
+        with self.transaction():
+            contributors = self.connection.execute(
+                "INSERT OR IGNORE INTO guild_contributors (guild_id, uid, note) "
+                "SELECT ?, uid, note FROM contributors WHERE server = ? ORDER BY rowid",
+                (guild_id, server),
+            ).rowcount
+            emojis = self.connection.execute(
+                "INSERT OR IGNORE INTO guild_contributor_emojis (guild_id, emoji_id, uid) "
+                "SELECT ?, emoji_id, uid FROM contributor_emojis WHERE server = ? ORDER BY rowid",
+                (guild_id, server),
+            ).rowcount
+            self.connection.execute(
+                "DELETE FROM contributors WHERE server = ?", (server,)
+            )
+            self.connection.execute(
+                "DELETE FROM contributor_emojis WHERE server = ?", (server,)
+            )
+        return contributors, emojis
+
+    def add_contributor(
+        self, guild_id: int, uid: str, note: str, emoji_id: Optional[str] = None
+    ) -> None:
+        """
+        Add a contributor, and optionally the emoji that mentions them, to a guild.
+        The write is committed with synchronous=FULL, as contributors are changed by hand and rarely.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        uid (str): The user ID of the contributor.
+        note (str): A note to identify the contributor, usually their username.
+        emoji_id (Optional[str]): The emoji associated with the contributor.
+        """
+        with self._synchronous_full(), self.transaction():
+            self.connection.execute(
+                "INSERT OR REPLACE INTO guild_contributors (guild_id, uid, note) VALUES (?, ?, ?)",
+                (guild_id, uid, note),
+            )
+            if emoji_id is not None:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO guild_contributor_emojis (guild_id, emoji_id, uid) VALUES (?, ?, ?)",
+                    (guild_id, emoji_id, uid),
+                )
+
+    def remove_contributor(self, guild_id: int, uid: str) -> None:
+        """
+        Remove a contributor, and every emoji that mentions them, from a guild.
+        The write is committed with synchronous=FULL, as contributors are changed by hand and rarely.
+
+        Parameters:
+        guild_id (int): The ID of the guild.
+        uid (str): The user ID of the contributor.
+        """
+        with self._synchronous_full(), self.transaction():
+            self.connection.execute(
+                "DELETE FROM guild_contributors WHERE guild_id = ? AND uid = ?",
+                (guild_id, uid),
+            )
+            self.connection.execute(
+                "DELETE FROM guild_contributor_emojis WHERE guild_id = ? AND uid = ?",
+                (guild_id, uid),
+            )
+
+    # Migration
+
+    def migrate_json_files(self) -> None:
+        """
+        Import the JSON files used by earlier versions of the bot.
+        The import runs in a single transaction, and the files are renamed with a .migrated suffix
+        once it has been committed, so they are only ever imported once.
+        """
+        files = [
+            (cfg.POSTED_EVENTS_FILE_PATH, self._import_posted_events),
+            (cfg.ONGOING_VOTES_FILE_PATH, self._import_ongoing_votes),
+            (cfg.CONTRIBUTORS_FILE_PATH, self._import_contributors),
+        ]
+        migrated = []
+
+        with self.transaction():
+            for file_path, importer in files:
+                if not os.path.exists(file_path):
+                    continue
+                logger.info(f"Migrating {file_path} into {self.path}")
+                with open(file_path, "r") as file:
+                    contents = file.read()
+                # Earlier versions could leave an empty file behind, there is nothing to import from it
+                if contents.strip():
+                    try:
+                        importer(json.loads(contents))
+                    except json.JSONDecodeError as e:
+                        logger.error(f"Skipping migration of {file_path}, Error: {e}")
+                        continue
+                migrated.append(file_path)
+
+        for file_path in migrated:
+            os.replace(file_path, f"{file_path}.migrated")
+
+    def _import_posted_events(self, data: List[int]) -> None:
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO posted_events (event_id) VALUES (?)",
+            [(event_id,) for event_id in data],
+        )
+
+    def _import_ongoing_votes(self, data: Dict[str, Any]) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO ongoing_votes (proposal_id, data) VALUES (?, ?)",
+            [(proposal_id, json.dumps(vote)) for proposal_id, vote in data.items()],
+        )
+
+    def _import_contributors(self, data: Dict[str, Any]) -> None:
+        for server, server_data in data.get("servers", {}).items():
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO contributors (server, uid, note) VALUES (?, ?, ?)",
+                [
+                    (server, contributor["uid"], contributor.get("note", ""))
+                    for contributor in server_data.get("contributors", [])
+                ],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO contributor_emojis (server, emoji_id, uid) VALUES (?, ?, ?)",
+                [
+                    (server, emoji_id, str(uid))
+                    for emoji_id, uid in server_data.get("emoji_dictionary", {}).items()
+                ],
+            )
+
+
+class _Transaction:
+    """
+    Context manager that commits the statements executed inside it, or rolls them back on error.
+    Nested uses join the outermost transaction.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.outermost = False
+
+    def __enter__(self) -> sqlite3.Connection:
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+            self.outermost = True
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.outermost:
+            return
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
@@ -0,0 +1,115 @@
+"""
+tasks/scheduler.py contains the DeadlineScheduler, which runs a callback for a key once the deadline of that key
+has passed.
+
+Deadlines are kept in a min-heap, so a single background task sleeps until the earliest deadline and then
+processes exactly the keys that are due. Scheduling an earlier deadline wakes the task up, and rescheduling or
+cancelling a key lazily invalidates its previous heap entry.
+The callback of each due key runs in its own task, so a slow or failing callback never delays the others.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from logger.logger import logger
+
+# Never sleep longer than this, so the scheduler recovers from adjustments to the system clock
+MAX_SLEEP = 3600
+
+
+class DeadlineScheduler:
+    def __init__(self, callback: Callable[[Hashable], Awaitable[None]], name: str):
+        self.callback = callback
+        self.name = name
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, float] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Schedule the callback for a key, replacing any deadline the key already had.
+
+        Parameters:
+        key (Hashable): The key passed to the callback.
+        deadline (float): The UNIX timestamp after which the callback is run.
+        """
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+        if self._heap[0][2] == key:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> None:
+        """
+        Cancel the callback for a key. Cancelling an unknown key is a no-op.
+
+        Parameters:
+        key (Hashable): The key to cancel.
+        """
+        self._deadlines.pop(key, None)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _pop_due(self, now: float) -> List[Hashable]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            # Skip entries that were rescheduled or cancelled
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            next_deadline = self._next_deadline()
+            timeout = (
+                None
+                if next_deadline is None
+                else min(next_deadline - time.time(), MAX_SLEEP)
+            )
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for key in self._pop_due(time.time()):
+                task = asyncio.create_task(self._run_callback(key))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run_callback(self, key: Hashable) -> None:
+        try:
+            await self.callback(key)
+        except Exception as e:
+            logger.error(f"Error running {self.name} for {key}: {e}")
@@ -1,21 +1,31 @@
 """
-tasks module contains the check_events task that is responsible for checking for upcoming events every 60 minutes, and the concluded_proposals_task that is responsible for checking for any proposals that have ended every 5 minutes.
-If there are any new events, they are posted to Discord. Interested users are identified and event details are formatted in a message and sent to the general channel.
+tasks module contains the check_events task that is responsible for checking for upcoming events every 60 minutes, and conclude_proposal, which bot.proposal_scheduler runs for each proposal as soon as its vote has ended.
+If there are any new events, they are posted to Discord. Interested users are identified and the new events of a guild are announced together in the general channel, split across as few messages as the length limit allows.
+Guilds are checked concurrently, up to EVENT_CHECK_CONCURRENCY at a time and each within EVENT_CHECK_GUILD_TIMEOUT, so a slow guild never delays the rest.
+When the bot is sharded, each process only checks the guilds on its own shards, and the gateway latency and check time of each shard are logged.
+It also contains the checkpoint_store task, which folds the write-ahead log of the store into the database file every CHECKPOINT_INTERVAL seconds once it has grown past CHECKPOINT_WAL_SIZE, and truncates it once it has grown past CHECKPOINT_TRUNCATE_WAL_SIZE.
 """
 
+import asyncio
+import sqlite3
 import time
-import subprocess
 import discord
+import config.config as cfg
 from logger.logger import logger
 from discord.ext import tasks, commands
-from events.event_operations import (
-    get_guild_scheduled_event_users,
-    save_posted_events,
-    fetch_upcoming_events,
+from events.event_operations import get_upcoming_events
+from events.announcement_builder import (
+    AnnouncementBuilder,
+    ANNOUNCEMENT_ALLOWED_MENTIONS,
 )
-from helpers.helpers import get_channel_by_name, update_ongoing_votes_file
+from helpers.helpers import get_channel_by_name
+from proposals.proposals import reconcile_votes
 from consts.constants import GENERAL_CHANNEL, YES_VOTE, NO_VOTE, ABSTAIN_VOTE
-from config.config import ONGOING_VOTES_FILE_PATH
+from storage.storage import Store
+from typing import Any, Dict, List, Optional, Tuple
+
+# How long to wait before retrying a proposal that could not be concluded
+CONCLUSION_RETRY_DELAY = 5 * 60
 
 
 @tasks.loop(minutes=60)
@@ -23,159 +33,245 @@ async def check_events(bot: commands.Bot) -> None:
     if not bot.is_ready():
         return
 
-    for guild in bot.guilds:
+    # Forget the events that are over, so the registry does not grow forever
+    bot.posted_events.prune()
+
+    # Check the guilds concurrently, at most EVENT_CHECK_CONCURRENCY at a time
+    semaphore = asyncio.Semaphore(cfg.EVENT_CHECK_CONCURRENCY)
+    start = time.perf_counter()
+    try:
+        timings = await asyncio.gather(
+            *(_check_guild_events(bot, guild, semaphore) for guild in bot.guilds)
+        )
+    finally:
+        # Persist every change made during this check at once
+        bot.posted_events.flush()
+
+    if timings:
+        slowest_guild, slowest_time = max(timings, key=lambda timing: timing[1])
+        logger.info(
+            f"Checked events for {len(timings)} guilds in {time.perf_counter() - start:.2f}s, slowest was {slowest_guild} at {slowest_time:.2f}s"
+        )
+
+    if isinstance(bot, commands.AutoShardedBot):
+        _log_shard_timings(bot, timings)
+
+
+def _log_shard_timings(
+    bot: commands.AutoShardedBot, timings: List[Tuple[discord.Guild, float]]
+) -> None:
+    # Report the gateway latency and the slowest guild check of each shard of this process
+    shard_timings: Dict[int, List[float]] = {}
+    for guild, elapsed in timings:
+        shard_timings.setdefault(guild.shard_id, []).append(elapsed)
+
+    for shard_id, latency in bot.latencies:
+        elapsed = shard_timings.get(shard_id, [])
+        logger.info(
+            f"Shard {shard_id}: gateway latency {latency * 1000:.0f}ms, checked {len(elapsed)} guilds, slowest at {max(elapsed, default=0.0):.2f}s"
+        )
+
+
+async def _check_guild_events(
+    bot: commands.Bot, guild: discord.Guild, semaphore: asyncio.Semaphore
+) -> Tuple[discord.Guild, float]:
+    """
+    Check a single guild for new upcoming events, bounded by EVENT_CHECK_GUILD_TIMEOUT.
+    Errors are logged rather than raised, so one guild never affects the others.
+
+    Parameters:
+    bot (commands.Bot): The bot instance.
+    guild (discord.Guild): The guild to check.
+    semaphore (asyncio.Semaphore): Limits how many guilds are checked at once.
+
+    Returns:
+    Tuple[discord.Guild, float]: The guild, and how long the check took in seconds.
+    """
+    async with semaphore:
+        start = time.perf_counter()
         try:
-            channel = get_channel_by_name(guild, GENERAL_CHANNEL)
-        except ValueError as e:
-            logger.error(f" Cannot check events for guild {guild}, Error: {e}")
-            continue
+            await asyncio.wait_for(
+                _post_new_events(bot, guild), cfg.EVENT_CHECK_GUILD_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Checking events for guild {guild} timed out after {cfg.EVENT_CHECK_GUILD_TIMEOUT}s"
+            )
+        except Exception as e:
+            logger.error(f"Error checking events for guild {guild}: {e}")
 
-        upcoming_events = await fetch_upcoming_events(guild)
+        elapsed = time.perf_counter() - start
+        logger.info(f"Checked events for guild {guild} in {elapsed:.2f}s")
+        return guild, elapsed
 
-        if not upcoming_events:
-            logger.info(f"No upcoming events in the next 24 hours for guild {guild}.")
-            continue
 
-        new_events = [
-            event for event in upcoming_events if event.id not in bot.posted_events
-        ]
-
-        if new_events:
-            for event in new_events:
-                users = get_guild_scheduled_event_users(guild.id, event.id)
-
-                guild_id = event.guild.id
-                user_mentions = [f"<@{user['user_id']}>" for user in users]
-                user_list_string = ", ".join(user_mentions)
-
-                formatted_string = (
-                    f"📆 **Upcoming Events in the Next 24 Hours** 📆 \n"
-                    f"\n"
-                    f":link: **Event Link https://discord.com/events/{guild_id}/{event.id} :link:**\n"
-                    f"\n"
-                    f"{user_list_string}\n"
-                )
-
-                await channel.send(formatted_string)
-                bot.posted_events.append(event.id)
-                save_posted_events(bot.posted_events)
-        else:
-            logger.info(
-                f"No new upcoming events in the next 24 hours for guild {guild}."
+async def _post_new_events(bot: commands.Bot, guild: discord.Guild) -> None:
+    try:
+        channel = get_channel_by_name(guild, GENERAL_CHANNEL)
+    except ValueError as e:
+        logger.error(f" Cannot check events for guild {guild}, Error: {e}")
+        return
+
+    upcoming_events = get_upcoming_events(guild)
+
+    if not upcoming_events:
+        logger.info(f"No upcoming events in the next 24 hours for guild {guild}.")
+        return
+
+    new_events = [
+        event for event in upcoming_events if event.id not in bot.posted_events
+    ]
+
+    if not new_events:
+        logger.info(f"No new upcoming events in the next 24 hours for guild {guild}.")
+        return
+
+    # Look up the interested users of every new event at once, then post them in order
+    interested_users = await asyncio.gather(
+        *(bot.interest_roster.get(guild.id, event.id) for event in new_events)
+    )
+
+    # Announce every new event of the guild in as few messages as possible
+    builder = AnnouncementBuilder("📆 **Upcoming Events in the Next 24 Hours** 📆 \n")
+    events_by_id = {}
+    for event, user_ids in zip(new_events, interested_users):
+        if user_ids is None:
+            logger.error(
+                f"Unable to fetch interested users for event {event.id}, retrying next check."
             )
+            continue
+
+        events_by_id[event.id] = event
+        builder.add_section(
+            event.id,
+            f":link: **Event Link https://discord.com/events/{guild.id}/{event.id} :link:**",
+            [f"<@{user_id}>" for user_id in sorted(user_ids)],
+        )
+
+    for content, event_ids in builder.build():
+        await channel.send(content, allowed_mentions=ANNOUNCEMENT_ALLOWED_MENTIONS)
+        # Events are only marked as posted once the message their section ends in has been sent
+        for event_id in event_ids:
+            bot.posted_events.add(events_by_id[event_id])
+
+
+@tasks.loop(seconds=cfg.CHECKPOINT_INTERVAL)
+async def checkpoint_store(store: Store) -> None:
+    wal_size = store.wal_size()
+    if wal_size < cfg.CHECKPOINT_WAL_SIZE:
+        return
+
+    # Only truncate the log when it is far past the limit, as readers in other processes can keep it from being reset
+    truncate = wal_size >= cfg.CHECKPOINT_TRUNCATE_WAL_SIZE
+    start = time.perf_counter()
+    try:
+        completed = store.checkpoint(truncate)
+    except sqlite3.Error as e:
+        logger.error(f"Unable to checkpoint the store: {e}")
+        return
+
+    if not completed:
+        logger.warning(
+            "Checkpoint of the store was held back by other connections, retrying next interval"
+        )
+        return
+    logger.info(
+        f"Checkpointed a {wal_size} byte write-ahead log in {time.perf_counter() - start:.2f}s"
+        + (", and truncated it" if truncate else "")
+    )
 
 
-@tasks.loop(minutes=5)
-async def check_concluded_proposals_task(bot: commands.Bot):
+async def conclude_proposal(bot: commands.Bot, proposal_id: str) -> None:
     """
-    This function is a task that runs every 5 minutes. It checks ongoing proposals and processes them if they have ended.
-    If a proposal has ended, and meets the criteria of passing, a snapshot proposal will be created.
+    Conclude a proposal whose vote has ended. This is run by bot.proposal_scheduler once the end_time of the proposal has passed.
+    The votes are counted, and the result is handed to bot.conclusion_outbox, which creates the snapshot proposal if the
+    proposal passed, announces the result and removes the proposal from the ongoing votes.
+    If the votes cannot be counted yet, for example because the thread cannot be found, it is retried after CONCLUSION_RETRY_DELAY.
 
     Parameters:
     bot (commands.Bot): The bot instance containing the ongoing_votes attribute.
+    proposal_id (str): The ID of the proposal that has ended.
 
     Returns:
     None
     """
-    if not bot.is_ready():
+    await bot.wait_until_ready()
+
+    proposal_data = bot.ongoing_votes.get(proposal_id)
+    # Proposals in the outbox have already been counted
+    if proposal_data is None or proposal_id in bot.conclusion_outbox:
         return
-    logger.info("Checking to see if proposals have ended")
+
+    logger.info(f"Concluding proposal {proposal_id}")
     try:
-        keys_to_remove = []  # Initialize list to store keys for removal
-
-        for proposal_id, proposal_data in bot.ongoing_votes.items():
-            if time.time() < proposal_data["end_time"]:
-                continue
-
-            channel = bot.get_channel(int(proposal_data["channel_id"]))
-
-            if channel:
-                thread = channel.get_thread(int(proposal_data["thread_id"]))
-                if thread:
-                    message = await thread.fetch_message(
-                        int(proposal_data["message_id"])
-                    )
-                    if not message:
-                        logger.error(
-                            f"Unable to find the message with id: {proposal_data['message_id']} in the thread: {thread.id}"
-                        )
-                        continue
-                else:
-                    logger.error(
-                        f"Unable to find the thread with id: {proposal_data['thread_id']} in the channel: {channel.name}"
-                    )
-                    continue
-            else:
-                logger.error(
-                    f"Unable to find the channel with id: {proposal_data['channel_id']}"
-                )
-                continue
-
-            # Update the Yes/No/Abstain counts from message reactions
-            counts = {
-                f"{YES_VOTE}": "yes_count",
-                f"{NO_VOTE}": "no_count",
-                f"{ABSTAIN_VOTE}": "abstain_count",
-            }
-            for reaction in message.reactions:
-                emoji = str(reaction.emoji)
-                if emoji in counts:
-                    # Subtract 1 from the count to account for the bot's own reaction
-                    proposal_data[counts[emoji]] = reaction.count - 1
-
-            # Check if the proposal has passed based off the yes and no count, and quorum of 5.
-            if (
-                proposal_data["yes_count"] > proposal_data["no_count"]
-                and proposal_data["yes_count"] >= 5
-            ):
-                passed = True
-            else:
-                passed = False
-
-            # Modify the result message based on the new condition
-            result_message = f"Vote for '{proposal_data['title']}' has concluded:\n\n"
-            if passed:
-                # Call the snapshot creation function
-                subprocess.run(
-                    [
-                        "node",
-                        "./snapshot/wrapper.js",
-                        proposal_data["title"],
-                        proposal_data["draft"]["abstract"],
-                        proposal_data["draft"]["background"],
-                        proposal_data["draft"]["additional"],
-                        "Adopt",
-                        "Reasses",
-                        "Abstain",
-                    ],
-                    check=True,
-                )
-                result_message += (
-                    "The vote passes! :tada: Snapshot proposal will now be created."
-                )
-            else:
-                result_message += "The vote fails. :disappointed:"
-
-            result_message += f"\nAdopt: {proposal_data['yes_count']}\nReasses: {proposal_data['no_count']}\nAbstain: {proposal_data['abstain_count']}"
-
-            logger.info(
-                f"Yes vote count: {proposal_data['yes_count']} No vote count: {proposal_data['no_count']} Abstain vote count: {proposal_data['abstain_count']}"
+        result = await _count_votes(bot, proposal_data)
+    except Exception as e:
+        logger.error(f"An error occurred while concluding proposal {proposal_id}: {e}")
+        result = None
+
+    if result is not None:
+        passed, result_message = result
+        bot.conclusion_outbox.enqueue(
+            proposal_id, proposal_data, passed, result_message
+        )
+    else:
+        bot.proposal_scheduler.schedule(
+            proposal_id, time.time() + CONCLUSION_RETRY_DELAY
+        )
+
+
+async def _count_votes(
+    bot: commands.Bot, proposal_data: Dict[str, Any]
+) -> Optional[Tuple[bool, str]]:
+    channel = bot.get_channel(int(proposal_data["channel_id"]))
+
+    if channel:
+        thread = channel.get_thread(int(proposal_data["thread_id"]))
+        if not thread:
+            logger.error(
+                f"Unable to find the thread with id: {proposal_data['thread_id']} in the channel: {channel.name}"
             )
+            return None
+    else:
+        logger.error(
+            f"Unable to find the channel with id: {proposal_data['channel_id']}"
+        )
+        return None
 
-            # Post the result message to the corresponding thread
-            try:
-                await thread.send(result_message)
-            except discord.HTTPException as e:
-                logger.error(f"An error occurred while posting the result message: {e}")
+    # Make sure no reactions made while the bot was offline are missed
+    message_id = int(proposal_data["message_id"])
+    if message_id not in bot.vote_ledger.reconciled:
+        message = await thread.fetch_message(message_id)
+        await reconcile_votes(bot, message)
 
-            keys_to_remove.append(proposal_id)  # Add the key for removal
+    # Read the Yes/No/Abstain counts from the vote ledger
+    tally = bot.vote_ledger.tally(message_id)
+    proposal_data["yes_count"] = tally[YES_VOTE]
+    proposal_data["no_count"] = tally[NO_VOTE]
+    proposal_data["abstain_count"] = tally[ABSTAIN_VOTE]
 
-        # Remove the concluded votes from ongoing_proposals
-        for key in keys_to_remove:
-            bot.ongoing_votes.pop(key)
+    # Check if the proposal has passed based off the yes and no count, and quorum of 5.
+    if (
+        proposal_data["yes_count"] > proposal_data["no_count"]
+        and proposal_data["yes_count"] >= 5
+    ):
+        passed = True
+    else:
+        passed = False
 
-        # Save to ongoing_votes.json
-        update_ongoing_votes_file(bot.ongoing_votes, ONGOING_VOTES_FILE_PATH)
+    # Modify the result message based on the new condition
+    result_message = f"Vote for '{proposal_data['title']}' has concluded:\n\n"
+    if passed:
+        result_message += (
+            "The vote passes! :tada: Snapshot proposal will now be created."
+        )
+    else:
+        result_message += "The vote fails. :disappointed:"
 
-    except Exception as e:
-        logger.error(f"An error occurred while checking ongoing proposals: {e}")
+    result_message += f"\nAdopt: {proposal_data['yes_count']}\nReasses: {proposal_data['no_count']}\nAbstain: {proposal_data['abstain_count']}"
+
+    logger.info(
+        f"Yes vote count: {proposal_data['yes_count']} No vote count: {proposal_data['no_count']} Abstain vote count: {proposal_data['abstain_count']}"
+    )
+
+    return passed, result_message
@@ -0,0 +1,70 @@
+"""
+tests/test_event_index.py tests that the scheduled event index only serves events that are scheduled or active.
+"""
+
+import asyncio
+import time
+import unittest
+import discord
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+from cogs.events import EventsCog
+from events.event_index import get_event_index, index_event, invalidate_event_index
+from events.event_operations import get_upcoming_events
+
+GUILD_ID = 1
+
+
+def make_event(event_id: int, name: str, starts_in: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=event_id,
+        guild_id=GUILD_ID,
+        name=name,
+        start_time=datetime.fromtimestamp(time.time() + starts_in, timezone.utc),
+        status=discord.EventStatus.scheduled,
+    )
+
+
+class ScheduledEventIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.standup = make_event(1, "Standup", 3600)
+        self.workshop = make_event(2, "Workshop", 7200)
+        self.guild = SimpleNamespace(
+            id=GUILD_ID, scheduled_events=[self.standup, self.workshop]
+        )
+        invalidate_event_index(GUILD_ID)
+        self.addCleanup(invalidate_event_index, GUILD_ID)
+
+    def test_event_canceled_inside_the_window_is_not_upcoming(self):
+        self.assertEqual(get_upcoming_events(self.guild), [self.standup, self.workshop])
+
+        # discord.py updates the cached event in place before dispatching the update
+        self.workshop.status = discord.EventStatus.canceled
+        index_event(self.workshop)
+
+        self.assertEqual(get_upcoming_events(self.guild), [self.standup])
+        event_index = get_event_index(self.guild)
+        self.assertIsNone(event_index.get_by_name("Workshop"))
+        self.assertEqual(event_index.search_names("work"), [])
+
+    def test_ended_events_are_not_indexed(self):
+        self.standup.status = discord.EventStatus.completed
+
+        self.assertEqual(get_upcoming_events(self.guild), [self.workshop])
+
+    def test_listener_drops_event_canceled_inside_the_window(self):
+        bot = mock.MagicMock()
+        cog = EventsCog(bot, contributors=mock.MagicMock())
+        get_event_index(self.guild)
+
+        self.workshop.status = discord.EventStatus.canceled
+        asyncio.run(cog.on_scheduled_event_update(self.workshop, self.workshop))
+
+        self.assertEqual(get_upcoming_events(self.guild), [self.standup])
+        bot.event_announcer.cancel.assert_called_once_with(self.workshop.id)
+        bot.interest_roster.forget.assert_called_once_with(self.workshop.id)
+
+
+if __name__ == "__main__":
+    unittest.main()